@@ -0,0 +1,170 @@
+import gzip
+import hashlib
+import mimetypes
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+import brotli
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.http_cache import is_not_modified
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+STATIC_URL_PREFIX = "/static"
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".svg", ".json", ".txt", ".html", ".xml"}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+ENCODING_PREFERENCE = ("br", "gzip")
+IMAGE_VARIANT_PATTERN = re.compile(r"^img/(?P<stem>.+)-(?P<width>\d+)w\.(?P<ext>png|webp)$")
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    name: str
+    versioned_name: str
+    path: Path
+    media_type: str
+    etag: str
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+
+def _versioned_name(name: str, digest: str) -> str:
+    path = Path(name)
+    return str(path.with_name(f"{path.stem}.{digest}{path.suffix}"))
+
+
+def _precompress(content: bytes) -> dict[str, bytes]:
+    encoded: dict[str, bytes] = {}
+    candidates = {
+        "br": brotli.compress(content, quality=11),
+        "gzip": gzip.compress(content, compresslevel=9, mtime=0),
+    }
+    for encoding, body in candidates.items():
+        if len(body) < len(content):
+            encoded[encoding] = body
+    return encoded
+
+
+class AssetManifest:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.by_name: dict[str, StaticAsset] = {}
+        self.by_versioned_name: dict[str, StaticAsset] = {}
+        self.image_variants: dict[tuple[str, str], list[tuple[int, StaticAsset]]] = {}
+
+        version = hashlib.sha256()
+        for path in sorted(directory.rglob("*")):
+            if not path.is_file() or any(part.startswith(".") for part in path.relative_to(directory).parts):
+                continue
+
+            name = path.relative_to(directory).as_posix()
+            content = path.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            asset = StaticAsset(
+                name=name,
+                versioned_name=_versioned_name(name, digest),
+                path=path,
+                media_type=media_type,
+                etag=f'"{digest}"',
+                encoded=_precompress(content) if path.suffix in COMPRESSIBLE_SUFFIXES else {},
+            )
+            self.by_name[name] = asset
+            self.by_versioned_name[asset.versioned_name] = asset
+            version.update(f"{name}:{digest}".encode("utf-8"))
+
+            variant = IMAGE_VARIANT_PATTERN.match(name)
+            if variant:
+                key = (variant.group("stem"), variant.group("ext"))
+                self.image_variants.setdefault(key, []).append((int(variant.group("width")), asset))
+
+        for variants in self.image_variants.values():
+            variants.sort(key=lambda item: item[0])
+        self.version = version.hexdigest()[:16]
+
+    def url(self, name: str) -> str:
+        asset = self.by_name.get(name)
+        if asset is None:
+            return f"{STATIC_URL_PREFIX}/{name}"
+        return f"{STATIC_URL_PREFIX}/{asset.versioned_name}"
+
+    def image_srcset(self, stem: str, ext: str) -> str:
+        variants = self.image_variants.get((stem, ext), [])
+        return ", ".join(f"{STATIC_URL_PREFIX}/{asset.versioned_name} {width}w" for width, asset in variants)
+
+    def image_url(self, stem: str, min_width: int, ext: str) -> str:
+        variants = self.image_variants.get((stem, ext))
+        if not variants:
+            return self.url(f"{stem}.{ext}")
+        for width, asset in variants:
+            if width >= min_width:
+                return f"{STATIC_URL_PREFIX}/{asset.versioned_name}"
+        return f"{STATIC_URL_PREFIX}/{variants[-1][1].versioned_name}"
+
+
+@lru_cache(maxsize=1)
+def get_asset_manifest() -> AssetManifest:
+    return AssetManifest(STATIC_DIR)
+
+
+def asset_url(name: str) -> str:
+    return get_asset_manifest().url(name)
+
+
+def image_srcset(stem: str, ext: str = "png") -> str:
+    return get_asset_manifest().image_srcset(stem, ext)
+
+
+def image_url(stem: str, min_width: int, ext: str = "png") -> str:
+    return get_asset_manifest().image_url(stem, min_width, ext)
+
+
+def preferred_encoding(accept_encoding: str, available: set[str] | dict[str, bytes]) -> str | None:
+    weights: dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        token, _, params = item.strip().partition(";")
+        if not token:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[token] = quality
+
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in available:
+            continue
+        if weights.get(encoding, weights.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        asset = get_asset_manifest().by_versioned_name.get(path)
+        if asset is None:
+            return await super().get_response(path, scope)
+
+        request_headers = Headers(scope=scope)
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            "ETag": asset.etag,
+            "Vary": "Accept-Encoding",
+        }
+        if is_not_modified(request_headers, asset.etag, None):
+            return Response(status_code=304, headers=headers)
+
+        encoding = preferred_encoding(request_headers.get("accept-encoding", ""), asset.encoded)
+        if encoding is None:
+            return FileResponse(asset.path, media_type=asset.media_type, headers=headers)
+
+        headers["Content-Encoding"] = encoding
+        return Response(asset.encoded[encoding], media_type=asset.media_type, headers=headers)
@@ -0,0 +1,78 @@
+import json
+import zlib
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, undefer
+
+from app.models import GenerationAttempt, GenerationAttemptResponse
+from app.researcher import GenerationAttemptRecord
+
+RESPONSE_ENCODING = "zlib"
+
+
+def serialize_response(payload: dict) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def decompress_response(blob: bytes, encoding: str = RESPONSE_ENCODING) -> dict:
+    if encoding != RESPONSE_ENCODING:
+        raise ValueError(f"Unsupported generation attempt encoding: {encoding}")
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def archive_generation_attempts(
+    db: Session,
+    city_id: int,
+    records: Iterable[GenerationAttemptRecord],
+    trigger: str = "manual",
+) -> None:
+    for record in records:
+        response = None
+        response_bytes = None
+        if record.response is not None:
+            raw = serialize_response(record.response)
+            response = zlib.compress(raw, level=9)
+            response_bytes = len(raw)
+        db.add(
+            GenerationAttempt(
+                city_id=city_id,
+                attempt=record.attempt,
+                trigger=trigger,
+                model=record.model,
+                prompt_key=record.prompt_key,
+                outcome=record.outcome,
+                error=record.error,
+                duration_ms=record.duration_ms,
+                response_encoding=RESPONSE_ENCODING,
+                response_bytes=response_bytes,
+                response=response,
+            )
+        )
+
+
+def list_generation_attempts(db: Session, city_id: int, limit: int = 20) -> list[GenerationAttemptResponse]:
+    attempts = db.scalars(
+        select(GenerationAttempt)
+        .options(undefer(GenerationAttempt.response))
+        .where(GenerationAttempt.city_id == city_id)
+        .order_by(GenerationAttempt.created_at.desc(), GenerationAttempt.id.desc())
+        .limit(limit)
+    ).all()
+    return [
+        GenerationAttemptResponse(
+            id=attempt.id,
+            attempt=attempt.attempt,
+            trigger=attempt.trigger,
+            model=attempt.model,
+            prompt_key=attempt.prompt_key,
+            outcome=attempt.outcome,
+            error=attempt.error,
+            duration_ms=attempt.duration_ms,
+            response_bytes=attempt.response_bytes,
+            stored_bytes=len(attempt.response) if attempt.response is not None else None,
+            response=decompress_response(attempt.response, attempt.response_encoding) if attempt.response else None,
+            created_at=attempt.created_at,
+        )
+        for attempt in attempts
+    ]
@@ -0,0 +1,164 @@
+import gzip
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import perf_counter
+
+import brotli
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.assets import preferred_encoding
+
+COMPRESSIBLE_MEDIA_TYPES = (
+    "text/html",
+    "text/plain",
+    "text/css",
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+)
+SUPPORTED_ENCODINGS = {"br", "gzip"}
+
+
+@dataclass(frozen=True)
+class CompressionStats:
+    encoding: str
+    original_bytes: int
+    compressed_bytes: int
+    duration_ms: float
+    cache_hit: bool
+
+    @property
+    def ratio(self) -> float:
+        if not self.original_bytes:
+            return 1.0
+        return round(self.compressed_bytes / self.original_bytes, 4)
+
+
+class CompressedBodyCache:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: OrderedDict[tuple[str, ...], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, ...]) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: tuple[str, ...], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+            self._entries[key] = body
+            self.current_bytes += len(body)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def compress_body(body: bytes, encoding: str, brotli_quality: int, gzip_level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def is_compressible(response: Response) -> bool:
+    content_type = response.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    return content_type in COMPRESSIBLE_MEDIA_TYPES
+
+
+def _weak_etag(etag: str | None) -> str | None:
+    if not etag or etag.startswith("W/"):
+        return etag
+    return f"W/{etag}"
+
+
+def _add_vary_accept_encoding(response: Response) -> None:
+    vary = response.headers.get("vary")
+    if not vary:
+        response.headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        response.headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+async def compress_response(
+    request: Request,
+    response: Response,
+    cache: CompressedBodyCache,
+    min_size_bytes: int,
+    brotli_quality: int,
+    gzip_level: int,
+) -> Response:
+    encoding = preferred_encoding(request.headers.get("accept-encoding", ""), SUPPORTED_ENCODINGS)
+
+    # A 304 must repeat the validator the 200 would have carried, and compressed 200s
+    # downgrade their ETag to weak, so revalidations do the same.
+    if response.status_code == 304:
+        if encoding and "etag" in response.headers:
+            response.headers["ETag"] = _weak_etag(response.headers["etag"])
+        return response
+
+    if (
+        request.method != "GET"
+        or response.status_code != 200
+        or "content-encoding" in response.headers
+        or not is_compressible(response)
+    ):
+        return response
+
+    _add_vary_accept_encoding(response)
+    content_length = response.headers.get("content-length")
+    if encoding is None or (content_length is not None and int(content_length) < min_size_bytes):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    headers = [(key, value) for key, value in response.raw_headers if key.lower() != b"content-length"]
+    if len(body) < min_size_bytes:
+        passthrough = Response(content=body, status_code=response.status_code)
+        passthrough.raw_headers = headers
+        passthrough.headers["Content-Length"] = str(len(body))
+        return passthrough
+
+    etag = response.headers.get("etag")
+    cache_key = (request.url.path, request.url.query, etag or "", encoding)
+    start_time = perf_counter()
+    compressed = cache.get(cache_key) if etag else None
+    cache_hit = compressed is not None
+    if compressed is None:
+        compressed = compress_body(body, encoding, brotli_quality=brotli_quality, gzip_level=gzip_level)
+        if etag:
+            cache.put(cache_key, compressed)
+
+    request.state.compression = CompressionStats(
+        encoding=encoding,
+        original_bytes=len(body),
+        compressed_bytes=len(compressed),
+        duration_ms=round((perf_counter() - start_time) * 1000, 3),
+        cache_hit=cache_hit,
+    )
+
+    compressed_response = Response(content=compressed, status_code=response.status_code)
+    compressed_response.raw_headers = headers
+    compressed_response.headers["Content-Encoding"] = encoding
+    compressed_response.headers["Content-Length"] = str(len(compressed))
+    if etag:
+        compressed_response.headers["ETag"] = _weak_etag(etag)
+    return compressed_response
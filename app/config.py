@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -9,9 +10,50 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     PERPLEXITY_API_KEY: str
     PERPLEXITY_MOCK_RESPONSE_FILE: str | None = None
+    PERPLEXITY_RESPONSE_CACHE_MODE: Literal["passthrough", "record", "replay"] = "passthrough"
+    PERPLEXITY_RESPONSE_CACHE_DIR: str = ".perplexity-cache"
+    PERPLEXITY_HTTP2: bool = True
+    PERPLEXITY_MAX_CONNECTIONS: int = 10
+    PERPLEXITY_MAX_KEEPALIVE_CONNECTIONS: int = 5
+    PERPLEXITY_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    PERPLEXITY_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    PERPLEXITY_READ_TIMEOUT_SECONDS: float = 60.0
+    PERPLEXITY_REQUESTS_PER_MINUTE: float = 50.0
+    PERPLEXITY_RATE_LIMIT_BURST: int = 5
+    PERPLEXITY_MAX_RETRIES: int = 4
+    PERPLEXITY_RETRY_BASE_SECONDS: float = 1.0
+    PERPLEXITY_RETRY_MAX_SECONDS: float = 60.0
     VERIFY_GENERATED_URLS: bool = True
     URL_VERIFICATION_TIMEOUT_SECONDS: float = 8.0
+    URL_VERIFICATION_MAX_CONCURRENCY: int = 8
+    URL_VERIFICATION_PER_HOST_CONCURRENCY: int = 2
+    URL_VERIFICATION_CACHE_ENABLED: bool = True
+    URL_VERIFICATION_CACHE_OK_TTL_HOURS: float = 168.0
+    URL_VERIFICATION_CACHE_FAIL_TTL_HOURS: float = 6.0
     ADMIN_API_KEY: str
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 60
+    HTTP_CACHE_STALE_WHILE_REVALIDATE_SECONDS: int = 86400
+    COMPRESSION_MIN_SIZE_BYTES: int = 512
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    GENERATION_WORKERS: int = 2
+    GENERATION_JOB_TIMEOUT_MINUTES: float = 15.0
+    GENERATION_JOB_HEARTBEAT_SECONDS: float = 60.0
+    METRICS_ENABLED: bool = True
+    TRACING_EXPORTER: Literal["none", "console", "jsonl"] = "none"
+    TRACING_JSONL_PATH: str = "traces.jsonl"
+    GENERATION_BATCH_WORKERS: int = 2
+    GENERATION_BATCH_CONCURRENCY: int = 4
+    GENERATION_BATCH_MAX_CONCURRENCY: int = 8
+    GENERATION_BATCH_MAX_CITIES: int = 100
+    STALE_AFTER_DAYS: int = 30
+    STALE_AFTER_JITTER_HOURS: float = 72.0
+    REFRESH_SCHEDULER_ENABLED: bool = False
+    REFRESH_INTERVAL_SECONDS: float = 900.0
+    REFRESH_CONCURRENCY: int = 2
+    REFRESH_DAILY_BUDGET: int = 20
+    REFRESH_RETRY_HOURS: float = 6.0
     POSTHOG_PUBLIC_KEY: str | None = None
     POSTHOG_HOST: str = "https://us.i.posthog.com"
     POSTHOG_DEBUG: bool = False
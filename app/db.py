@@ -1,20 +1,60 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.config import get_settings
+from app.metrics import gauge
 
 settings = get_settings()
 
+
+def async_database_url(database_url: str) -> str:
+    url = make_url(database_url)
+    url = url.set(drivername="postgresql+asyncpg")
+    # asyncpg spells libpq's sslmode as ssl.
+    if "sslmode" in url.query:
+        url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": url.query["sslmode"]})
+    return url.render_as_string(hide_password=False)
+
+
 engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+async_engine = create_async_engine(async_database_url(settings.DATABASE_URL), pool_pre_ping=True)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
+def _pool_stat(stat: str) -> dict[tuple[str, ...], float]:
+    pools = {"sync": engine.pool, "async": async_engine.pool}
+    # QueuePool reports overflow as negative while it still has idle capacity.
+    return {(name,): max(0, getattr(pool, stat)()) for name, pool in pools.items()}
+
+
+gauge(
+    "groundwork_db_pool_checked_out",
+    "Database connections currently checked out of the pool.",
+    ("engine",),
+    collect=lambda: _pool_stat("checkedout"),
+)
+gauge(
+    "groundwork_db_pool_overflow",
+    "Database connections open beyond the pool size.",
+    ("engine",),
+    collect=lambda: _pool_stat("overflow"),
+)
+gauge("groundwork_db_pool_size", "Configured database pool size.", ("engine",), collect=lambda: _pool_stat("size"))
+
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
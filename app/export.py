@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import tempfile
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, undefer
+from starlette.requests import Request
+
+from app.assets import get_asset_manifest
+from app.db import SessionLocal
+from app.main import city_page_context, html_etag, index_page_context, ready_city_cards, templates
+from app.models import City
+
+EXPORT_MANIFEST_NAME = ".export-manifest.json"
+DEFAULT_BASE_URL = "https://groundwork.potniq.com"
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def build_export_request(base_url: str, path: str) -> Request:
+    parts = urlsplit(base_url)
+    scheme = parts.scheme or "https"
+    port = parts.port or (443 if scheme == "https" else 80)
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": scheme,
+            "server": (parts.hostname or "localhost", port),
+            "path": path,
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", parts.netloc.encode("latin-1"))],
+        }
+    )
+
+
+def _write_if_changed(path: Path, content: bytes) -> bool:
+    if path.is_file() and path.read_bytes() == content:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    return True
+
+
+def _load_export_manifest(output_dir: Path) -> dict[str, object]:
+    try:
+        return json.loads((output_dir / EXPORT_MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def export_static_assets(output_dir: Path) -> int:
+    written = 0
+    static_dir = output_dir / "static"
+    for asset in get_asset_manifest().by_name.values():
+        content = asset.path.read_bytes()
+        written += _write_if_changed(static_dir / asset.name, content)
+        written += _write_if_changed(static_dir / asset.versioned_name, content)
+        for encoding, body in asset.encoded.items():
+            written += _write_if_changed(static_dir / f"{asset.versioned_name}{ENCODING_SUFFIXES[encoding]}", body)
+    return written
+
+
+def city_page_path(output_dir: Path, slug: str) -> Path:
+    return output_dir / slug / "index.html"
+
+
+def export_site(db: Session, output_dir: Path, base_url: str = DEFAULT_BASE_URL) -> dict[str, int]:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    previous = _load_export_manifest(output_dir)
+    site_version = html_etag(build_export_request(base_url, "/"))
+    previous_cities: dict[str, str] = previous.get("cities", {}) if previous.get("site_version") == site_version else {}
+
+    versions = {
+        slug: retrieved_at.isoformat() if retrieved_at else ""
+        for slug, retrieved_at in db.execute(select(City.slug, City.retrieved_at).where(City.status == "ready")).all()
+    }
+    changed = sorted(
+        slug
+        for slug, version in versions.items()
+        if previous_cities.get(slug) != version or not city_page_path(output_dir, slug).is_file()
+    )
+
+    for city in db.scalars(select(City).options(undefer(City.intel)).where(City.slug.in_(changed))) if changed else []:
+        request = build_export_request(base_url, f"/{city.slug}")
+        html = templates.get_template("city.html").render(city_page_context(request, city))
+        _write_if_changed(city_page_path(output_dir, city.slug), html.encode("utf-8"))
+
+    removed = 0
+    for slug in set(previous.get("cities", {})) - set(versions):
+        page = city_page_path(output_dir, slug)
+        if page.is_file():
+            page.unlink()
+            removed += 1
+        if page.parent.is_dir() and not any(page.parent.iterdir()):
+            page.parent.rmdir()
+
+    request = build_export_request(base_url, "/")
+    index_html = templates.get_template("index.html").render(index_page_context(request, ready_city_cards(db)))
+    _write_if_changed(output_dir / "index.html", index_html.encode("utf-8"))
+    assets_written = export_static_assets(output_dir)
+
+    manifest = {"site_version": site_version, "base_url": base_url, "cities": versions}
+    _write_if_changed(output_dir / EXPORT_MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    return {
+        "rendered": len(changed),
+        "unchanged": len(versions) - len(changed),
+        "removed": removed,
+        "assets_written": assets_written,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the public Groundwork site as static files.")
+    parser.add_argument("--output", default="dist/site", help="Directory to write the static site into.")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="Public origin used for canonical and og:url tags.")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = export_site(db, Path(args.output), base_url=args.base_url)
+    finally:
+        db.close()
+
+    print(
+        "Export complete. "
+        f"rendered={result['rendered']} unchanged={result['unchanged']} "
+        f"removed={result['removed']} assets_written={result['assets_written']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import heapq
+import math
+import threading
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass
+
+EARTH_RADIUS_KM = 6371.0088
+
+Vector = tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class GeoPoint:
+    slug: str
+    city_name: str
+    country: str
+    country_code: str
+    latitude: float
+    longitude: float
+
+
+@dataclass(frozen=True)
+class _Node:
+    vector: Vector
+    point: GeoPoint
+    axis: int
+    left: "_Node | None"
+    right: "_Node | None"
+
+
+def to_unit_vector(latitude: float, longitude: float) -> Vector:
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def chord_to_km(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class CityKDTree:
+    # Points live on the unit sphere in 3D, where straight-line (chord) distance orders
+    # exactly like great-circle distance and there is no antimeridian or pole seam.
+
+    def __init__(self, points: Sequence[GeoPoint]) -> None:
+        entries = [(to_unit_vector(point.latitude, point.longitude), point) for point in points]
+        self.size = len(entries)
+        self._root = self._build(entries, 0)
+
+    def _build(self, entries: list[tuple[Vector, GeoPoint]], depth: int) -> _Node | None:
+        if not entries:
+            return None
+        axis = depth % 3
+        entries.sort(key=lambda entry: entry[0][axis])
+        median = len(entries) // 2
+        vector, point = entries[median]
+        return _Node(
+            vector=vector,
+            point=point,
+            axis=axis,
+            left=self._build(entries[:median], depth + 1),
+            right=self._build(entries[median + 1 :], depth + 1),
+        )
+
+    def nearest(self, latitude: float, longitude: float, k: int) -> list[tuple[float, GeoPoint]]:
+        if k <= 0 or self._root is None:
+            return []
+
+        target = to_unit_vector(latitude, longitude)
+        # Max-heap of the best k so far, keyed on negated squared chord length.
+        best: list[tuple[float, int, GeoPoint]] = []
+        stack: list[tuple[_Node, float]] = [(self._root, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if len(best) == k and bound >= -best[0][0]:
+                continue
+
+            squared = sum((a - b) ** 2 for a, b in zip(node.vector, target, strict=True))
+            if len(best) < k:
+                heapq.heappush(best, (-squared, id(node), node.point))
+            elif squared < -best[0][0]:
+                heapq.heapreplace(best, (-squared, id(node), node.point))
+
+            delta = target[node.axis] - node.vector[node.axis]
+            near, far = (node.left, node.right) if delta < 0 else (node.right, node.left)
+            if far is not None:
+                stack.append((far, max(bound, delta * delta)))
+            if near is not None:
+                stack.append((near, bound))
+
+        ranked = sorted(((-negated, point) for negated, _, point in best), key=lambda item: item[0])
+        return [(chord_to_km(math.sqrt(squared)), point) for squared, point in ranked]
+
+
+_city_index: tuple[Hashable, CityKDTree] | None = None
+_city_index_lock = threading.Lock()
+
+
+def get_city_index(version: Hashable, load_points: Callable[[], Sequence[GeoPoint]]) -> CityKDTree:
+    global _city_index
+    current = _city_index
+    if current is not None and current[0] == version:
+        return current[1]
+
+    with _city_index_lock:
+        if _city_index is None or _city_index[0] != version:
+            _city_index = (version, CityKDTree(load_points()))
+        return _city_index[1]
+
+
+def reset_city_index() -> None:
+    global _city_index
+    with _city_index_lock:
+        _city_index = None
@@ -0,0 +1,70 @@
+import hashlib
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Response, status
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    return tag
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return format_datetime(value.astimezone(UTC), usegmt=True)
+
+
+def is_not_modified(request_headers: Mapping[str, str], etag: str, last_modified: datetime | None) -> bool:
+    # If-None-Match wins over If-Modified-Since and uses weak comparison (RFC 9110 13.1.2),
+    # so compressed variants that downgrade the tag to W/ still revalidate.
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {_opaque_tag(tag) for tag in if_none_match.split(",") if tag.strip()}
+        return _opaque_tag(etag) in candidates
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if not if_modified_since or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=UTC)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def cache_headers(
+    etag: str,
+    last_modified: datetime | None,
+    max_age_seconds: int,
+    stale_while_revalidate_seconds: int,
+) -> dict[str, str]:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={max_age_seconds}, stale-while-revalidate={stale_while_revalidate_seconds}"
+        ),
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified_response(headers: Mapping[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(headers))
@@ -0,0 +1,166 @@
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import exists, func, update
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db import SessionLocal
+from app.models import City, GenerationJob
+
+INTERRUPTED_JOB_ERROR = "Generation was interrupted (worker restarted or timed out)"
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_batch_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_owned_jobs: set[int] = set()
+_owned_jobs_lock = threading.Lock()
+_heartbeat_thread: threading.Thread | None = None
+_heartbeat_stop = threading.Event()
+_heartbeat_lock = threading.Lock()
+
+
+def start_job_executor(max_workers: int | None = None) -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = max_workers or get_settings().GENERATION_WORKERS
+            _executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="groundwork-job")
+            logger.info("Started generation job executor", extra={"max_workers": workers})
+        return _executor
+
+
+def start_batch_executor(max_workers: int | None = None) -> ThreadPoolExecutor:
+    # Batches coordinate on their own threads so a running batch never occupies a GENERATION_WORKERS slot.
+    global _batch_executor
+    with _executor_lock:
+        if _batch_executor is None:
+            workers = max_workers or get_settings().GENERATION_BATCH_WORKERS
+            _batch_executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="groundwork-batch-runner")
+            logger.info("Started generation batch executor", extra={"max_workers": workers})
+        return _batch_executor
+
+
+def shutdown_job_executor(wait: bool = False) -> None:
+    global _executor, _batch_executor
+    with _executor_lock:
+        executors = [_executor, _batch_executor]
+        _executor = None
+        _batch_executor = None
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def submit_job(fn: Callable[..., object], *args: object) -> Future:
+    return start_job_executor().submit(fn, *args)
+
+
+def submit_batch(fn: Callable[..., object], *args: object) -> Future:
+    return start_batch_executor().submit(fn, *args)
+
+
+def track_jobs(job_ids: list[int]) -> None:
+    with _owned_jobs_lock:
+        _owned_jobs.update(job_ids)
+
+
+def untrack_job(job_id: int) -> None:
+    with _owned_jobs_lock:
+        _owned_jobs.discard(job_id)
+
+
+def owned_jobs() -> set[int]:
+    with _owned_jobs_lock:
+        return set(_owned_jobs)
+
+
+def beat_owned_jobs(db: Session, now: datetime | None = None) -> int:
+    job_ids = owned_jobs()
+    if not job_ids:
+        return 0
+    beaten = db.execute(
+        update(GenerationJob)
+        .where(GenerationJob.id.in_(job_ids), GenerationJob.status.in_(("queued", "running")))
+        .values(heartbeat_at=now or datetime.now(UTC))
+        .returning(GenerationJob.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return len(beaten)
+
+
+def run_heartbeat_loop(stop: threading.Event) -> None:
+    interval = get_settings().GENERATION_JOB_HEARTBEAT_SECONDS
+    while not stop.wait(interval):
+        db = SessionLocal()
+        try:
+            beat_owned_jobs(db)
+        except Exception:  # noqa: BLE001
+            logger.exception("Generation job heartbeat failed")
+        finally:
+            db.close()
+
+
+def start_job_heartbeat() -> threading.Thread:
+    global _heartbeat_thread
+    with _heartbeat_lock:
+        if _heartbeat_thread is None or not _heartbeat_thread.is_alive():
+            _heartbeat_stop.clear()
+            _heartbeat_thread = threading.Thread(
+                target=run_heartbeat_loop,
+                args=(_heartbeat_stop,),
+                name="groundwork-job-heartbeat",
+                daemon=True,
+            )
+            _heartbeat_thread.start()
+        return _heartbeat_thread
+
+
+def stop_job_heartbeat(timeout: float | None = 5.0) -> None:
+    global _heartbeat_thread
+    with _heartbeat_lock:
+        thread = _heartbeat_thread
+        _heartbeat_thread = None
+    _heartbeat_stop.set()
+    if thread is not None:
+        thread.join(timeout)
+
+
+def recover_stale_generations(db: Session, now: datetime | None = None) -> tuple[int, int]:
+    # Jobs live in process memory, so a restart strands queued/running rows and their cities in "generating".
+    # The owning process heartbeats every job it still holds, queued or running, so only jobs whose owner
+    # stopped beating expire; a job waiting behind a long batch is left alone.
+    now = now or datetime.now(UTC)
+    cutoff = now - timedelta(minutes=get_settings().GENERATION_JOB_TIMEOUT_MINUTES)
+    last_seen = func.coalesce(GenerationJob.heartbeat_at, GenerationJob.started_at, GenerationJob.created_at)
+    stale_job = [GenerationJob.status.in_(("queued", "running")), last_seen < cutoff]
+    owned = owned_jobs()
+    if owned:
+        stale_job.append(GenerationJob.id.not_in(owned))
+    jobs = db.execute(
+        update(GenerationJob)
+        .where(*stale_job)
+        .values(status="failed", error=INTERRUPTED_JOB_ERROR, finished_at=now)
+        .returning(GenerationJob.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    active_job = exists().where(GenerationJob.city_id == City.id, GenerationJob.status.in_(("queued", "running")))
+    cities = db.execute(
+        update(City)
+        .where(City.status == "generating", City.updated_at < cutoff, ~active_job)
+        .values(status="failed")
+        .returning(City.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+
+    if jobs or cities:
+        logger.warning("Recovered stale generations", extra={"failed_jobs": len(jobs), "failed_cities": len(cities)})
+    return len(jobs), len(cities)
@@ -1,47 +1,147 @@
-import json
+import hashlib
 import logging
 import re
 import unicodedata
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
 from time import perf_counter
 from typing import Annotated
+from uuid import uuid4
 
-from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response, status
 from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, Session
 
+from app.assets import FingerprintedStaticFiles, asset_url, get_asset_manifest, image_srcset, image_url
+from app.attempts import archive_generation_attempts, list_generation_attempts
+from app.compression import CompressedBodyCache, compress_response
 from app.config import get_settings
-from app.db import get_db
-from app.models import City, CityIntel, CityListItem, CityRequest, CityRequestCreate, CityResponse, CreateCityRequest
-from app.researcher import generate_intel
+from app.db import SessionLocal, async_engine, get_async_db, get_db
+from app.geo import GeoPoint, get_city_index
+from app.http_cache import cache_headers, is_not_modified, make_etag, not_modified_response
+from app.jobs import (
+    recover_stale_generations,
+    shutdown_job_executor,
+    start_batch_executor,
+    start_job_executor,
+    start_job_heartbeat,
+    stop_job_heartbeat,
+    submit_batch,
+    submit_job,
+    track_jobs,
+    untrack_job,
+)
+from app.matching import MatchCandidate, get_city_matcher, normalize_text
+from app.metrics import EXPOSITION_CONTENT_TYPE, gauge, histogram, render_metrics
+from app.models import (
+    City,
+    CityIntel,
+    CityListItem,
+    CityRequest,
+    CityRequestCreate,
+    CityRequestMatch,
+    CityRequestResult,
+    CityResponse,
+    CitySearchResult,
+    CreateCityBatchRequest,
+    CreateCityRequest,
+    GenerationAttemptResponse,
+    GenerationBatchResponse,
+    GenerationJob,
+    GenerationJobResponse,
+    NearbyCity,
+    RejectedBatchCity,
+)
+from app.pagination import InvalidCursorError, decode_cursor, next_page_headers, page_url, split_page
+from app.refresh import REFRESH_TRIGGER, next_stale_after, start_refresh_scheduler, stop_refresh_scheduler
+from app.researcher import GenerationAttemptRecord, close_perplexity_client, generate_intel, get_perplexity_client
+from app.search import search_cities
+from app.tracing import install_log_record_factory, span
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    yield
+    get_asset_manifest()
+    get_perplexity_client()
+    start_job_executor()
+    start_batch_executor()
+    start_job_heartbeat()
+    recover_generations_on_startup()
+    if get_settings().REFRESH_SCHEDULER_ENABLED:
+        start_refresh_scheduler(run_city_refresh)
+    try:
+        yield
+    finally:
+        stop_refresh_scheduler()
+        stop_job_heartbeat()
+        shutdown_job_executor()
+        close_perplexity_client()
+        await async_engine.dispose()
 
 
 app = FastAPI(title="Groundwork by Potniq", lifespan=lifespan)
 logger = logging.getLogger("groundwork.app")
+install_log_record_factory()
 
 BASE_DIR = Path(__file__).resolve().parent
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
-app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
+templates.env.globals["asset_url"] = asset_url
+templates.env.globals["image_srcset"] = image_srcset
+templates.env.globals["image_url"] = image_url
+app.mount("/static", FingerprintedStaticFiles(directory=str(BASE_DIR / "static")), name="static")
+compressed_body_cache = CompressedBodyCache(max_bytes=get_settings().COMPRESSION_CACHE_MAX_BYTES)
+HTTP_REQUESTS_IN_FLIGHT = gauge("groundwork_http_requests_in_flight", "HTTP requests currently being served.")
+HTTP_REQUEST_SECONDS = histogram(
+    "groundwork_http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code.",
+    ("method", "route", "status"),
+)
+
+
+# Registered before log_requests so it runs inside it and log_requests can report its stats.
+@app.middleware("http")
+async def compress_responses(request: Request, call_next):
+    settings = get_settings()
+    response = await call_next(request)
+    return await compress_response(
+        request,
+        response,
+        compressed_body_cache,
+        min_size_bytes=settings.COMPRESSION_MIN_SIZE_BYTES,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    )
+
+
+def route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    if route is not None:
+        return route.path_format
+    if request.url.path.startswith("/static/"):
+        return "/static"
+    # Unmatched paths are collapsed so scanners can't blow up label cardinality.
+    return "unmatched"
 
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = perf_counter()
+    HTTP_REQUESTS_IN_FLIGHT.inc()
 
     try:
         response = await call_next(request)
     except Exception:
+        HTTP_REQUEST_SECONDS.observe(
+            perf_counter() - start_time, method=request.method, route=route_template(request), status=500
+        )
         duration_ms = round((perf_counter() - start_time) * 1000, 2)
         logger.exception(
             "Unhandled request error",
@@ -52,7 +152,12 @@ async def log_requests(request: Request, call_next):
             },
         )
         raise
+    finally:
+        HTTP_REQUESTS_IN_FLIGHT.dec()
 
+    HTTP_REQUEST_SECONDS.observe(
+        perf_counter() - start_time, method=request.method, route=route_template(request), status=response.status_code
+    )
     duration_ms = round((perf_counter() - start_time) * 1000, 2)
     log_details = {
         "method": request.method,
@@ -60,6 +165,18 @@ async def log_requests(request: Request, call_next):
         "status_code": response.status_code,
         "duration_ms": duration_ms,
     }
+    compression = getattr(request.state, "compression", None)
+    if compression is not None:
+        log_details.update(
+            {
+                "compression_encoding": compression.encoding,
+                "compression_original_bytes": compression.original_bytes,
+                "compression_compressed_bytes": compression.compressed_bytes,
+                "compression_ratio": compression.ratio,
+                "compression_ms": compression.duration_ms,
+                "compression_cache_hit": compression.cache_hit,
+            }
+        )
 
     if response.status_code >= 500:
         logger.error("Request completed with server error", extra=log_details)
@@ -87,6 +204,57 @@ def template_context(request: Request, **context: object) -> dict[str, object]:
     }
 
 
+@lru_cache(maxsize=1)
+def template_fingerprint() -> str:
+    digest = hashlib.sha256()
+    for path in sorted((BASE_DIR / "templates").rglob("*.html")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    digest.update(get_asset_manifest().version.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def html_etag(request: Request, *parts: object) -> str:
+    settings = get_settings()
+    return make_etag(
+        "html",
+        template_fingerprint(),
+        request.base_url,
+        settings.POSTHOG_PUBLIC_KEY,
+        settings.POSTHOG_HOST,
+        settings.POSTHOG_DEBUG,
+        settings.POSTHOG_CAPTURE_CONSOLE_ERRORS,
+        settings.POSTHOG_RECORD_CONSOLE_LOGS,
+        *parts,
+    )
+
+
+def response_cache_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    settings = get_settings()
+    return cache_headers(
+        etag,
+        last_modified,
+        max_age_seconds=settings.HTTP_CACHE_MAX_AGE_SECONDS,
+        stale_while_revalidate_seconds=settings.HTTP_CACHE_STALE_WHILE_REVALIDATE_SECONDS,
+    )
+
+
+def catalog_version_query() -> Select:
+    # The latest updated_at is taken over every city, so a city leaving the ready set still moves the version.
+    ready_count = select(func.count(City.id)).where(City.status == "ready").scalar_subquery()
+    return select(ready_count, select(func.max(City.updated_at)).scalar_subquery())
+
+
+def catalog_version(db: Session) -> tuple[int, datetime | None]:
+    count, latest = db.execute(catalog_version_query()).one()
+    return count, latest
+
+
+async def catalog_version_async(db: AsyncSession) -> tuple[int, datetime | None]:
+    count, latest = (await db.execute(catalog_version_query())).one()
+    return count, latest
+
+
 def slugify(value: str) -> str:
     normalized = unicodedata.normalize("NFKD", value)
     ascii_value = normalized.encode("ascii", "ignore").decode("ascii")
@@ -111,7 +279,7 @@ def should_render_html_error_page(request: Request) -> bool:
         return False
 
     path = request.url.path
-    if path.startswith("/static") or path.startswith("/cities") or path == "/health":
+    if path.startswith(("/static", "/cities", "/jobs", "/batches", "/search")) or path in {"/health", "/metrics"}:
         return False
 
     return True
@@ -166,7 +334,7 @@ def to_city_response(city: City) -> CityResponse:
     )
 
 
-def to_city_list_item(city: City) -> CityListItem:
+def to_city_list_item(city: City | Row) -> CityListItem:
     return CityListItem(
         slug=city.slug,
         city_name=city.city_name,
@@ -176,8 +344,7 @@ def to_city_list_item(city: City) -> CityListItem:
     )
 
 
-def build_city_card(city: City) -> dict[str, str | bool]:
-    intel = CityIntel.model_validate(city.intel) if city.intel else None
+def intel_summary_columns(intel: CityIntel | None) -> dict[str, bool | list[str]]:
     has_metro = bool(intel and any(mode.type == "metro" for mode in intel.modes))
     contactless = bool(
         intel
@@ -189,25 +356,142 @@ def build_city_card(city: City) -> dict[str, str | bool]:
     if intel:
         rideshare = [option.provider for option in intel.rideshare if option.available]
 
+    return {
+        "has_metro": has_metro,
+        "contactless": contactless,
+        "rideshare_providers": rideshare,
+    }
+
+
+CITY_CARD_COLUMNS = (
+    City.slug,
+    City.city_name,
+    City.country,
+    City.country_code,
+    City.has_metro,
+    City.contactless,
+    City.rideshare_providers,
+)
+CITY_LIST_COLUMNS = (City.slug, City.city_name, City.country, City.country_code, City.status)
+CITIES_DEFAULT_PAGE_SIZE = 100
+CITIES_MAX_PAGE_SIZE = 500
+REQUESTS_PAGE_SIZE = 50
+
+
+def ready_cities_query(*columns: InstrumentedAttribute) -> Select:
+    # Matches idx_cities_ready_listing, so listings are served by an index-only scan; slug makes the order total.
+    return (
+        select(*columns)
+        .where(City.status == "ready")
+        .order_by(City.retrieved_at.desc(), City.city_name.asc(), City.slug.asc())
+    )
+
+
+def load_city_points(db: Session) -> list[GeoPoint]:
+    rows = db.execute(
+        select(City.slug, City.city_name, City.country, City.country_code, City.latitude, City.longitude).where(
+            City.status == "ready", City.latitude.is_not(None), City.longitude.is_not(None)
+        )
+    ).all()
+    return [GeoPoint(**row._mapping) for row in rows]
+
+
+def load_match_candidates(db: Session) -> list[MatchCandidate]:
+    rows = db.execute(
+        select(City.id, City.slug, City.city_name, City.country, City.country_code).where(City.status == "ready")
+    ).all()
+    return [
+        MatchCandidate(
+            city_id=row.id,
+            slug=row.slug,
+            city_name=row.city_name,
+            country=row.country,
+            country_code=row.country_code,
+        )
+        for row in rows
+    ]
+
+
+def build_city_card(city: City | Row) -> dict[str, str | bool]:
+    rideshare = city.rideshare_providers or []
     return {
         "slug": city.slug,
         "city_name": city.city_name,
         "country": city.country,
         "country_code": city.country_code,
         "flag": country_flag(city.country_code),
-        "has_metro": has_metro,
-        "contactless": contactless,
+        "has_metro": city.has_metro,
+        "contactless": city.contactless,
         "rideshare": ", ".join(rideshare) if rideshare else "None listed",
     }
 
 
-def create_city_profile(db: Session, payload: CreateCityRequest) -> City:
+def ready_city_cards(db: Session) -> list[dict[str, str | bool]]:
+    cities = db.execute(ready_cities_query(*CITY_CARD_COLUMNS)).all()
+    return [build_city_card(city) for city in cities]
+
+
+def index_page_context(request: Request, cards: list[dict[str, str | bool]]) -> dict[str, object]:
+    return template_context(
+        request,
+        cities=cards,
+        analytics_context={
+            "page_name": "home",
+            "city_count": len(cards),
+        },
+        analytics_super_properties={
+            "current_page_name": "home",
+        },
+        analytics_reset_properties=[
+            "current_city_slug",
+            "current_city_name",
+            "current_country",
+        ],
+    )
+
+
+def city_page_context(request: Request, city: City) -> dict[str, object]:
+    intel = CityIntel.model_validate(city.intel) if city.intel else None
+    return template_context(
+        request,
+        city=city,
+        intel=intel,
+        flag=country_flag(city.country_code),
+        analytics_context={
+            "page_name": "city_guide",
+            "city_slug": city.slug,
+            "city_name": city.city_name,
+            "country": city.country,
+            "authority_count": len(intel.authorities) if intel else 0,
+            "mode_count": len(intel.modes) if intel else 0,
+            "payment_method_count": len(intel.payment_methods) if intel else 0,
+            "airport_connection_count": len(intel.airport_connections) if intel else 0,
+            "has_metro": city.has_metro,
+        },
+        analytics_super_properties={
+            "current_page_name": "city_guide",
+            "current_city_slug": city.slug,
+            "current_city_name": city.city_name,
+            "current_country": city.country,
+        },
+    )
+
+
+def city_slug(payload: CreateCityRequest) -> str:
     generated_slug = slugify(f"{payload.city_name}-{payload.country_code}")
-    slug = (payload.slug or generated_slug).strip()
+    return (payload.slug or generated_slug).strip()
+
+
+def prepare_city_profile(db: Session, payload: CreateCityRequest) -> City:
+    slug = city_slug(payload)
     if not slug:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Slug cannot be empty")
 
     existing = db.scalar(select(City).where(City.slug == slug))
+    if existing and existing.status == "generating":
+        # A generation orphaned by a restart must not block regeneration forever.
+        recover_stale_generations(db)
+        db.refresh(existing)
     if existing and existing.status == "generating":
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="City is currently generating")
 
@@ -221,8 +505,9 @@ def create_city_profile(db: Session, payload: CreateCityRequest) -> City:
         city.metro_area_name = None
         city.status = "generating"
         city.intel = None
-        city.raw_response = None
         city.stale_after = None
+        for column, value in intel_summary_columns(None).items():
+            setattr(city, column, value)
     else:
         city = City(
             slug=slug,
@@ -238,23 +523,240 @@ def create_city_profile(db: Session, payload: CreateCityRequest) -> City:
 
     db.commit()
     db.refresh(city)
+    return city
 
+
+def apply_city_intel(city: City, intel: CityIntel) -> None:
+    city.status = "ready"
+    city.intel = intel.model_dump()
+    for column, value in intel_summary_columns(intel).items():
+        setattr(city, column, value)
+    city.retrieved_at = datetime.now(UTC)
+    city.stale_after = next_stale_after(city.retrieved_at)
+
+
+def generate_city_profile(db: Session, city: City) -> City:
+    attempts: list[GenerationAttemptRecord] = []
     try:
-        intel = generate_intel(city.city_name, city.country)
-        city.status = "ready"
-        city.intel = intel.model_dump()
-        city.raw_response = json.dumps(city.intel)
-        city.retrieved_at = datetime.now(UTC)
-        city.stale_after = city.retrieved_at + timedelta(days=30)
+        intel = generate_intel(city.city_name, city.country, on_attempt=attempts.append)
+        apply_city_intel(city, intel)
     except Exception as exc:  # noqa: BLE001
         city.status = "failed"
+        with span("db.commit", status="failed", attempt_count=len(attempts)):
+            archive_generation_attempts(db, city.id, attempts)
+            db.commit()
+            db.refresh(city)
+        raise RuntimeError(str(exc)) from exc
+
+    with span("db.commit", status="ready", attempt_count=len(attempts)):
+        archive_generation_attempts(db, city.id, attempts)
         db.commit()
         db.refresh(city)
-        raise RuntimeError(str(exc)) from exc
+    return city
+
+
+def create_city_profile(db: Session, payload: CreateCityRequest) -> City:
+    with span("create_city_profile", city=payload.city_name, country=payload.country):
+        with span("db.prepare_city"):
+            city = prepare_city_profile(db, payload)
+        return generate_city_profile(db, city)
+
+
+def refresh_city_profile(db: Session, city_id: int) -> bool:
+    city = db.get(City, city_id)
+    if city is None or city.status != "ready":
+        return False
+
+    # The current intel keeps being served until a replacement has passed validation.
+    attempts: list[GenerationAttemptRecord] = []
+    try:
+        intel = generate_intel(city.city_name, city.country, on_attempt=attempts.append)
+    except Exception as exc:  # noqa: BLE001
+        archive_generation_attempts(db, city.id, attempts, trigger=REFRESH_TRIGGER)
+        db.commit()
+        logger.warning("Stale refresh failed; keeping previous intel", extra={"slug": city.slug, "error": str(exc)})
+        return False
 
-    db.commit()
     db.refresh(city)
-    return city
+    if city.status != "ready":
+        # An admin regeneration took over while this refresh was running.
+        db.rollback()
+        return False
+
+    apply_city_intel(city, intel)
+    archive_generation_attempts(db, city.id, attempts, trigger=REFRESH_TRIGGER)
+    db.commit()
+    logger.info("Refreshed stale city", extra={"slug": city.slug})
+    return True
+
+
+def run_city_refresh(city_id: int) -> bool:
+    db = SessionLocal()
+    try:
+        return refresh_city_profile(db, city_id)
+    except Exception:  # noqa: BLE001
+        logger.exception("Stale refresh crashed", extra={"city_id": city_id})
+        return False
+    finally:
+        db.close()
+
+
+def enqueue_city_generation(db: Session, city: City) -> GenerationJob:
+    job = GenerationJob(city_id=city.id, slug=city.slug, status="queued")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    track_jobs([job.id])
+    submit_job(run_generation_job, job.id)
+    return job
+
+
+def process_generation_job(db: Session, job_id: int) -> GenerationJob | None:
+    job = db.get(GenerationJob, job_id)
+    if job is None:
+        logger.warning("Generation job not found", extra={"job_id": job_id})
+        return None
+    if job.status != "queued":
+        # Already failed by recover_stale_generations while it waited in the queue.
+        logger.warning("Skipping generation job that is no longer queued", extra={"job_id": job_id})
+        return job
+
+    city = db.get(City, job.city_id)
+    job.status = "running"
+    job.started_at = datetime.now(UTC)
+    db.commit()
+
+    if city is None:
+        job.status = "failed"
+        job.error = "City no longer exists"
+    else:
+        try:
+            generate_city_profile(db, city)
+        except Exception as exc:  # noqa: BLE001
+            job.status = "failed"
+            job.error = str(exc)
+            logger.warning("Generation job failed", extra={"job_id": job.id, "slug": job.slug, "detail": str(exc)})
+        else:
+            job.status = "succeeded"
+
+    job.finished_at = datetime.now(UTC)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def recover_generations_on_startup() -> None:
+    db = SessionLocal()
+    try:
+        recover_stale_generations(db)
+    except Exception:  # noqa: BLE001
+        logger.exception("Stale generation recovery failed")
+    finally:
+        db.close()
+
+
+def run_generation_job(job_id: int) -> None:
+    db = SessionLocal()
+    try:
+        with span("generation_job", job_id=job_id):
+            process_generation_job(db, job_id)
+    except Exception:  # noqa: BLE001
+        logger.exception("Generation job crashed", extra={"job_id": job_id})
+    finally:
+        untrack_job(job_id)
+        db.close()
+
+
+def enqueue_city_batch(
+    db: Session,
+    payloads: list[CreateCityRequest],
+    concurrency: int,
+) -> tuple[str, list[RejectedBatchCity]]:
+    batch_id = uuid4().hex
+    jobs: list[GenerationJob] = []
+    rejected: list[RejectedBatchCity] = []
+    for payload in payloads:
+        try:
+            city = prepare_city_profile(db, payload)
+        except HTTPException as exc:
+            rejected.append(RejectedBatchCity(slug=city_slug(payload), detail=str(exc.detail)))
+            continue
+        jobs.append(GenerationJob(city_id=city.id, slug=city.slug, batch_id=batch_id, status="queued"))
+
+    if jobs:
+        db.add_all(jobs)
+        db.commit()
+        job_ids = [job.id for job in jobs]
+        track_jobs(job_ids)
+        submit_batch(run_generation_batch, job_ids, concurrency)
+    return batch_id, rejected
+
+
+def run_generation_batch(job_ids: list[int], concurrency: int) -> None:
+    # Runs on the batch executor and fans out on its own pool, so batches never take GENERATION_WORKERS
+    # slots from single-city jobs and their parallelism is independent of it.
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="groundwork-batch") as pool:
+        list(pool.map(run_generation_job, job_ids))
+    logger.info("Generation batch finished", extra={"job_count": len(job_ids)})
+
+
+def to_generation_batch_response(
+    db: Session,
+    batch_id: str,
+    concurrency: int | None = None,
+    rejected: list[RejectedBatchCity] | None = None,
+) -> GenerationBatchResponse:
+    jobs = db.scalars(select(GenerationJob).where(GenerationJob.batch_id == batch_id).order_by(GenerationJob.id)).all()
+    city_statuses = dict(
+        db.execute(select(City.id, City.status).where(City.id.in_({job.city_id for job in jobs}))).tuples().all()
+    )
+    counts = Counter(job.status for job in jobs)
+    return GenerationBatchResponse(
+        batch_id=batch_id,
+        total=len(jobs),
+        queued=counts["queued"],
+        running=counts["running"],
+        succeeded=counts["succeeded"],
+        failed=counts["failed"],
+        concurrency=concurrency,
+        jobs=[
+            GenerationJobResponse.model_validate(job).model_copy(update={"city_status": city_statuses.get(job.city_id)})
+            for job in jobs
+        ],
+        rejected=rejected or [],
+    )
+
+
+def to_generation_job_response(db: Session, job: GenerationJob) -> GenerationJobResponse:
+    city_status = db.scalar(select(City.status).where(City.id == job.city_id))
+    return GenerationJobResponse(
+        id=job.id,
+        slug=job.slug,
+        batch_id=job.batch_id,
+        status=job.status,
+        city_status=city_status,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+def parse_cursor(cursor: str | None, *types: type) -> tuple | None:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, *types)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+def require_admin_key(x_api_key: str | None) -> None:
+    settings = get_settings()
+    if x_api_key is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing X-API-Key header")
+    if x_api_key != settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid API key")
 
 
 @app.exception_handler(StarletteHTTPException)
@@ -312,65 +814,143 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    if not get_settings().METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return Response(render_metrics(), media_type=EXPOSITION_CONTENT_TYPE)
+
+
 @app.get("/", response_class=HTMLResponse)
-def get_index(request: Request, db: Session = Depends(get_db)) -> HTMLResponse:
-    cities = db.scalars(
-        select(City)
-        .where(City.status == "ready")
-        .order_by(City.retrieved_at.desc(), City.city_name.asc())
-    ).all()
-    cards = [build_city_card(city) for city in cities]
-    return templates.TemplateResponse(
-        request,
-        "index.html",
-        template_context(
-            request,
-            cities=cards,
-            analytics_context={
-                "page_name": "home",
-                "city_count": len(cards),
-            },
-            analytics_super_properties={
-                "current_page_name": "home",
-            },
-            analytics_reset_properties=[
-                "current_city_slug",
-                "current_city_name",
-                "current_country",
-            ],
-        ),
-    )
+async def get_index(request: Request, db: AsyncSession = Depends(get_async_db)) -> Response:
+    city_count, last_modified = await catalog_version_async(db)
+    headers = response_cache_headers(html_etag(request, "index", city_count, last_modified), last_modified)
+    if is_not_modified(request.headers, headers["ETag"], last_modified):
+        return not_modified_response(headers)
+
+    cards = [build_city_card(city) for city in (await db.execute(ready_cities_query(*CITY_CARD_COLUMNS))).all()]
+    return templates.TemplateResponse(request, "index.html", index_page_context(request, cards), headers=headers)
 
 
 @app.get("/cities", response_model=list[CityListItem])
-def get_cities(db: Session = Depends(get_db)) -> list[CityListItem]:
-    cities = db.scalars(
-        select(City)
-        .where(City.status == "ready")
-        .order_by(City.retrieved_at.desc(), City.city_name.asc())
-    ).all()
+async def get_cities(
+    request: Request,
+    response: Response,
+    limit: Annotated[int, Query(ge=1, le=CITIES_MAX_PAGE_SIZE)] = CITIES_DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> list[CityListItem] | Response:
+    after = parse_cursor(cursor, datetime, str, str)
+    city_count, last_modified = await catalog_version_async(db)
+    headers = response_cache_headers(make_etag("cities", city_count, last_modified, limit, cursor), last_modified)
+    if is_not_modified(request.headers, headers["ETag"], last_modified):
+        return not_modified_response(headers)
+
+    query = ready_cities_query(*CITY_LIST_COLUMNS, City.retrieved_at)
+    if after:
+        retrieved_at, city_name, slug = after
+        # The inclusive bound is the index seek; the OR only drops rows tied on retrieved_at.
+        query = query.where(
+            City.retrieved_at <= retrieved_at,
+            or_(City.retrieved_at < retrieved_at, tuple_(City.city_name, City.slug) > (city_name, slug)),
+        )
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    cities, next_cursor = split_page(rows, limit, lambda city: (city.retrieved_at, city.city_name, city.slug))
+    response.headers.update(headers)
+    response.headers.update(next_page_headers(request, next_cursor))
     return [to_city_list_item(city) for city in cities]
 
 
+@app.get("/search", response_model=list[CitySearchResult])
+def search(
+    request: Request,
+    response: Response,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: Annotated[int, Query(ge=1, le=50)] = 20,
+    db: Session = Depends(get_db),
+) -> list[CitySearchResult] | Response:
+    city_count, last_modified = catalog_version(db)
+    headers = response_cache_headers(make_etag("search", city_count, last_modified, q, limit), last_modified)
+    if is_not_modified(request.headers, headers["ETag"], last_modified):
+        return not_modified_response(headers)
+
+    response.headers.update(headers)
+    return [CitySearchResult.model_validate(row) for row in search_cities(db, q, limit)]
+
+
+@app.get("/cities/near", response_model=list[NearbyCity])
+def get_nearby_cities(
+    request: Request,
+    response: Response,
+    lat: Annotated[float, Query(ge=-90, le=90)],
+    lon: Annotated[float, Query(ge=-180, le=180)],
+    limit: Annotated[int, Query(ge=1, le=20)] = 5,
+    db: Session = Depends(get_db),
+) -> list[NearbyCity] | Response:
+    version = catalog_version(db)
+    headers = response_cache_headers(make_etag("near", *version, lat, lon, limit), version[1])
+    if is_not_modified(request.headers, headers["ETag"], version[1]):
+        return not_modified_response(headers)
+
+    index = get_city_index(version, lambda: load_city_points(db))
+    response.headers.update(headers)
+    return [
+        NearbyCity(
+            slug=point.slug,
+            city_name=point.city_name,
+            country=point.country,
+            country_code=point.country_code,
+            latitude=point.latitude,
+            longitude=point.longitude,
+            distance_km=round(distance_km, 1),
+        )
+        for distance_km, point in index.nearest(lat, lon, limit)
+    ]
+
+
 @app.get("/cities/{slug}", response_model=CityResponse)
-def get_city(slug: str, db: Session = Depends(get_db)) -> CityResponse:
-    city = db.scalar(select(City).where(City.slug == slug))
+async def get_city(
+    slug: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+) -> CityResponse | Response:
+    # intel stays deferred until the validators have been checked, so a 304 never reads the JSONB.
+    city = await db.scalar(select(City).where(City.slug == slug))
     if not city:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="City not found")
+
+    headers = response_cache_headers(make_etag("city", city.slug, city.updated_at), city.updated_at)
+    if is_not_modified(request.headers, headers["ETag"], city.updated_at):
+        return not_modified_response(headers)
+
+    await db.refresh(city, ["intel"])
+    response.headers.update(headers)
     return to_city_response(city)
 
 
-@app.post("/cities", response_model=CityResponse, status_code=status.HTTP_201_CREATED)
+@app.post(
+    "/cities",
+    response_model=CityResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": GenerationJobResponse}},
+)
 def create_city(
     payload: CreateCityRequest,
+    background: bool = False,
     db: Session = Depends(get_db),
     x_api_key: Annotated[str | None, Header(alias="X-API-Key")] = None,
-) -> CityResponse:
-    settings = get_settings()
-    if x_api_key is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing X-API-Key header")
-    if x_api_key != settings.ADMIN_API_KEY:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid API key")
+) -> CityResponse | JSONResponse:
+    require_admin_key(x_api_key)
+
+    if background:
+        city = prepare_city_profile(db, payload)
+        job = enqueue_city_generation(db, city)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=to_generation_job_response(db, job).model_dump(mode="json"),
+            headers={"Location": f"/jobs/{job.id}"},
+        )
 
     try:
         city = create_city_profile(db, payload)
@@ -382,25 +962,140 @@ def create_city(
     return to_city_response(city)
 
 
-@app.post("/requests", status_code=status.HTTP_201_CREATED)
-def request_city(payload: CityRequestCreate, db: Session = Depends(get_db)) -> dict[str, str]:
-    city_request = CityRequest(raw_input=payload.raw_input, email=payload.email, status="pending")
+@app.post("/cities/batch", response_model=GenerationBatchResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_city_batch(
+    payload: CreateCityBatchRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    x_api_key: Annotated[str | None, Header(alias="X-API-Key")] = None,
+) -> GenerationBatchResponse:
+    require_admin_key(x_api_key)
+
+    settings = get_settings()
+    if len(payload.cities) > settings.GENERATION_BATCH_MAX_CITIES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"A batch may contain at most {settings.GENERATION_BATCH_MAX_CITIES} cities",
+        )
+
+    concurrency = min(
+        payload.concurrency or settings.GENERATION_BATCH_CONCURRENCY,
+        settings.GENERATION_BATCH_MAX_CONCURRENCY,
+    )
+    batch_id, rejected = enqueue_city_batch(db, payload.cities, concurrency)
+    response.headers["Location"] = f"/batches/{batch_id}"
+    return to_generation_batch_response(db, batch_id, concurrency=concurrency, rejected=rejected)
+
+
+@app.get("/batches/{batch_id}", response_model=GenerationBatchResponse)
+def get_batch(
+    batch_id: str,
+    db: Session = Depends(get_db),
+    x_api_key: Annotated[str | None, Header(alias="X-API-Key")] = None,
+) -> GenerationBatchResponse:
+    require_admin_key(x_api_key)
+
+    batch = to_generation_batch_response(db, batch_id)
+    if not batch.jobs:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
+    return batch
+
+
+@app.get("/jobs/{job_id}", response_model=GenerationJobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    x_api_key: Annotated[str | None, Header(alias="X-API-Key")] = None,
+) -> GenerationJobResponse:
+    require_admin_key(x_api_key)
+
+    job = db.get(GenerationJob, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return to_generation_job_response(db, job)
+
+
+@app.get("/cities/{slug}/attempts", response_model=list[GenerationAttemptResponse])
+def get_city_generation_attempts(
+    slug: str,
+    db: Session = Depends(get_db),
+    x_api_key: Annotated[str | None, Header(alias="X-API-Key")] = None,
+) -> list[GenerationAttemptResponse]:
+    require_admin_key(x_api_key)
+
+    city_id = db.scalar(select(City.id).where(City.slug == slug))
+    if city_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="City not found")
+    return list_generation_attempts(db, city_id)
+
+
+@app.post("/requests", status_code=status.HTTP_201_CREATED, response_model=CityRequestResult)
+def request_city(payload: CityRequestCreate, db: Session = Depends(get_db)) -> CityRequestResult:
+    match = get_city_matcher(catalog_version(db), lambda: load_match_candidates(db)).match(payload.raw_input)
+    city_request = CityRequest(
+        raw_input=payload.raw_input,
+        email=payload.email,
+        status="fulfilled" if match and match.confident else "pending",
+        normalized_input=match.normalized_input if match else normalize_text(payload.raw_input),
+        matched_city_id=match.city.city_id if match else None,
+        match_score=match.score if match else None,
+    )
     db.add(city_request)
     db.commit()
-    return {"message": "Thanks, we received your city request."}
+
+    if match is None:
+        return CityRequestResult(message="Thanks, we received your city request.")
+
+    city = match.city
+    if match.confident:
+        message = f"Good news: we already have a guide for {city.city_name}, {city.country}."
+    else:
+        message = (
+            f"Thanks, we received your city request. Did you mean {city.city_name}, {city.country}? "
+            "We already have a guide for it."
+        )
+    return CityRequestResult(
+        message=message,
+        match=CityRequestMatch(
+            slug=city.slug,
+            city_name=city.city_name,
+            country=city.country,
+            url=f"/{city.slug}",
+            score=match.score,
+        ),
+    )
 
 
 @app.get("/requests", response_class=HTMLResponse)
-def get_requests_page(request: Request, db: Session = Depends(get_db)) -> HTMLResponse:
-    city_requests = db.scalars(
-        select(CityRequest).order_by(CityRequest.requested_at.desc(), CityRequest.id.desc())
-    ).all()
+async def get_requests_page(
+    request: Request,
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> HTMLResponse:
+    after = parse_cursor(cursor, datetime, int)
+    query = select(CityRequest).order_by(CityRequest.requested_at.desc(), CityRequest.id.desc())
+    if after:
+        query = query.where(tuple_(CityRequest.requested_at, CityRequest.id) < tuple_(*after))
+    rows = (await db.scalars(query.limit(REQUESTS_PAGE_SIZE + 1))).all()
+    city_requests, next_cursor = split_page(rows, REQUESTS_PAGE_SIZE, lambda item: (item.requested_at, item.id))
+    matched_ids = {item.matched_city_id for item in city_requests if item.matched_city_id is not None}
+    matched_cities = (
+        {
+            row.id: row
+            for row in await db.execute(select(City.id, City.slug, City.city_name).where(City.id.in_(matched_ids)))
+        }
+        if matched_ids
+        else {}
+    )
     return templates.TemplateResponse(
         request,
         "requests.html",
         template_context(
             request,
             city_requests=city_requests,
+            matched_cities=matched_cities,
+            older_url=page_url(request, next_cursor) if next_cursor else None,
+            newest_url=page_url(request, None) if cursor else None,
             analytics_context={
                 "page_name": "requests",
                 "request_count": len(city_requests),
@@ -418,34 +1113,14 @@ def get_requests_page(request: Request, db: Session = Depends(get_db)) -> HTMLRe
 
 
 @app.get("/{slug}", response_class=HTMLResponse)
-def get_city_page(slug: str, request: Request, db: Session = Depends(get_db)) -> HTMLResponse:
-    city = db.scalar(select(City).where(City.slug == slug, City.status == "ready"))
+async def get_city_page(slug: str, request: Request, db: AsyncSession = Depends(get_async_db)) -> Response:
+    city = await db.scalar(select(City).where(City.slug == slug, City.status == "ready"))
     if not city:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="City page not found")
 
-    intel = CityIntel.model_validate(city.intel) if city.intel else None
-    has_metro = bool(intel and any(mode.type == "metro" for mode in intel.modes))
-    context = template_context(
-        request,
-        city=city,
-        intel=intel,
-        flag=country_flag(city.country_code),
-        analytics_context={
-            "page_name": "city_guide",
-            "city_slug": city.slug,
-            "city_name": city.city_name,
-            "country": city.country,
-            "authority_count": len(intel.authorities) if intel else 0,
-            "mode_count": len(intel.modes) if intel else 0,
-            "payment_method_count": len(intel.payment_methods) if intel else 0,
-            "airport_connection_count": len(intel.airport_connections) if intel else 0,
-            "has_metro": has_metro,
-        },
-        analytics_super_properties={
-            "current_page_name": "city_guide",
-            "current_city_slug": city.slug,
-            "current_city_name": city.city_name,
-            "current_country": city.country,
-        },
-    )
-    return templates.TemplateResponse(request, "city.html", context)
+    headers = response_cache_headers(html_etag(request, "city", city.slug, city.updated_at), city.updated_at)
+    if is_not_modified(request.headers, headers["ETag"], city.updated_at):
+        return not_modified_response(headers)
+
+    await db.refresh(city, ["intel"])
+    return templates.TemplateResponse(request, "city.html", city_page_context(request, city), headers=headers)
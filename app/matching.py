@@ -0,0 +1,233 @@
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass
+
+SUGGEST_THRESHOLD = 0.55
+CONFIDENT_THRESHOLD = 0.85
+# Ceiling for hits too weak to trust: a comma head in another country ("London, Ontario"), initials and short
+# codes ("sd" is San Diego and Santo Domingo), and any exact key shared by several cities.
+UNCONFIDENT_MATCH_SCORE = 0.75
+
+# Colloquial names and codes that share too few trigrams with the official name to be found fuzzily.
+CITY_ALIASES: dict[str, tuple[str, ...]] = {
+    "amsterdam-nl": ("ams", "mokum"),
+    "bangkok-th": ("bkk", "krung thep"),
+    "barcelona-es": ("bcn", "barna"),
+    "chicago-us": ("chitown", "windy city"),
+    "dubai-ae": ("dxb",),
+    "hong-kong-hk": ("hkg",),
+    "istanbul-tr": ("constantinople",),
+    "johannesburg-za": ("joburg", "jozi", "jhb", "egoli"),
+    "lisbon-pt": ("lisboa",),
+    "london-gb": ("ldn",),
+    "los-angeles-us": ("lax",),
+    "mexico-city-mx": ("cdmx", "ciudad de mexico"),
+    "milan-it": ("milano",),
+    "mumbai-in": ("bombay", "bom"),
+    "new-york-us": ("nyc", "new york city", "big apple", "manhattan"),
+    "paris-fr": ("cdg",),
+    "rome-it": ("roma",),
+    "san-francisco-us": ("sfo", "san fran", "frisco", "bay area"),
+    "sao-paulo-br": ("sampa",),
+    "seoul-kr": ("icn",),
+    "shanghai-cn": ("pvg",),
+    "stockholm-se": ("sthlm",),
+    "sydney-au": ("syd",),
+    "tokyo-jp": ("tyo",),
+    "vienna-at": ("wien",),
+    "zurich-ch": ("zrh", "zuerich"),
+}
+
+# Short codes and clippings that other places share ("la" is also Las Palmas, "chi" also Chisinau); they are
+# only ever offered as suggestions, like the auto-generated initials.
+CITY_SHORT_ALIASES: dict[str, tuple[str, ...]] = {
+    "amsterdam-nl": ("dam",),
+    "berlin-de": ("ber",),
+    "chicago-us": ("chi",),
+    "hong-kong-hk": ("hk",),
+    "istanbul-tr": ("ist",),
+    "london-gb": ("lon",),
+    "los-angeles-us": ("la",),
+    "mexico-city-mx": ("df",),
+    "new-york-us": ("ny",),
+    "san-francisco-us": ("sf",),
+    "sao-paulo-br": ("sp",),
+    "shanghai-cn": ("sha",),
+    "singapore-sg": ("sin", "sg"),
+}
+
+COUNTRY_ALIASES: dict[str, tuple[str, ...]] = {
+    "ae": ("uae",),
+    "gb": ("uk", "britain", "great britain", "england", "scotland", "wales", "northern ireland"),
+    "nl": ("holland", "the netherlands"),
+    "us": ("usa", "united states of america", "america"),
+}
+
+
+@dataclass(frozen=True)
+class MatchCandidate:
+    city_id: int
+    slug: str
+    city_name: str
+    country: str
+    country_code: str
+
+
+@dataclass(frozen=True)
+class CityMatch:
+    city: MatchCandidate
+    normalized_input: str
+    score: float
+
+    @property
+    def confident(self) -> bool:
+        return self.score >= CONFIDENT_THRESHOLD
+
+
+def normalize_text(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value)
+    ascii_value = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", ascii_value.lower()).split())
+
+
+def trigrams(value: str) -> set[str]:
+    grams: set[str] = set()
+    for word in value.split():
+        padded = f"  {word} "
+        grams.update(padded[index : index + 3] for index in range(len(padded) - 2))
+    return grams
+
+
+def _initials(name: str) -> str | None:
+    words = name.split()
+    return "".join(word[0] for word in words) if len(words) > 1 else None
+
+
+def candidate_aliases(candidate: MatchCandidate) -> set[str]:
+    name = normalize_text(candidate.city_name)
+    country = normalize_text(candidate.country)
+    aliases = {
+        name,
+        normalize_text(candidate.slug),
+        f"{name} {country}",
+        f"{name} {candidate.country_code.lower()}",
+    }
+    if name.endswith(" city"):
+        aliases.add(name.removesuffix(" city"))
+    aliases.update(normalize_text(alias) for alias in CITY_ALIASES.get(candidate.slug, ()))
+    return {alias for alias in aliases if alias}
+
+
+def weak_aliases(candidate: MatchCandidate) -> set[str]:
+    aliases = {normalize_text(alias) for alias in CITY_SHORT_ALIASES.get(candidate.slug, ())}
+    aliases.add(_initials(normalize_text(candidate.city_name)))
+    return {alias for alias in aliases if alias} - candidate_aliases(candidate)
+
+
+def country_names(candidate: MatchCandidate) -> set[str]:
+    code = candidate.country_code.lower()
+    names = {normalize_text(candidate.country), code}
+    names.update(COUNTRY_ALIASES.get(code, ()))
+    return {name for name in names if name}
+
+
+def _tail_names_country(tail: list[str], candidate: MatchCandidate) -> bool:
+    return bool(tail) and any(part in country_names(candidate) for part in tail)
+
+
+class CityMatcher:
+    def __init__(self, candidates: Sequence[MatchCandidate]) -> None:
+        self._exact: dict[str, dict[int, tuple[MatchCandidate, bool]]] = defaultdict(dict)
+        self._aliases: list[tuple[str, set[str], MatchCandidate, bool]] = []
+        self._by_trigram: dict[str, list[int]] = defaultdict(list)
+
+        for candidate in candidates:
+            weak = weak_aliases(candidate)
+            for alias in candidate_aliases(candidate) | weak:
+                is_weak = alias in weak
+                self._exact[alias].setdefault(candidate.city_id, (candidate, is_weak))
+                grams = trigrams(alias)
+                position = len(self._aliases)
+                self._aliases.append((alias, grams, candidate, is_weak))
+                for gram in grams:
+                    self._by_trigram[gram].append(position)
+
+    def match(self, raw_input: str) -> CityMatch | None:
+        normalized = normalize_text(raw_input)
+        if not normalized:
+            return None
+
+        exact = self._exact_score(normalized)
+        if exact is not None and exact[0] >= CONFIDENT_THRESHOLD:
+            return CityMatch(city=exact[1], normalized_input=normalized, score=exact[0])
+
+        # "Paris, France" and "Portland, Oregon" style inputs: also try the part before the first comma,
+        # but only trust it fully when a later part names the candidate's country.
+        head, *rest = raw_input.split(",")
+        head = normalize_text(head)
+        tail = [part for part in (normalize_text(value) for value in rest) if part]
+        variants = [(normalized, False)]
+        if head and head != normalized:
+            variants.append((head, True))
+
+        best: tuple[float, MatchCandidate] | None = None
+        for variant, head_only in variants:
+            exact = self._exact_score(variant)
+            scored = [exact] if exact is not None else self._fuzzy_scores(variant)
+            for score, candidate in scored:
+                if head_only and not _tail_names_country(tail, candidate):
+                    score = min(score, UNCONFIDENT_MATCH_SCORE)
+                if best is None or score > best[0]:
+                    best = (score, candidate)
+
+        if best is None or best[0] < SUGGEST_THRESHOLD:
+            return None
+        return CityMatch(city=best[1], normalized_input=normalized, score=round(best[0], 3))
+
+    def _exact_score(self, variant: str) -> tuple[float, MatchCandidate] | None:
+        entries = self._exact.get(variant)
+        if not entries:
+            return None
+        # Prefer a city that owns the key outright; a key shared by several cities is only ever a suggestion.
+        candidate, weak = min(entries.values(), key=lambda entry: (entry[1], entry[0].city_id))
+        if weak or len(entries) > 1:
+            return UNCONFIDENT_MATCH_SCORE, candidate
+        return 1.0, candidate
+
+    def _fuzzy_scores(self, variant: str) -> list[tuple[float, MatchCandidate]]:
+        grams = trigrams(variant)
+        shared: dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for position in self._by_trigram.get(gram, ()):
+                shared[position] += 1
+        scores = []
+        for position, overlap in shared.items():
+            _, alias_grams, candidate, weak = self._aliases[position]
+            score = 2 * overlap / (len(grams) + len(alias_grams))
+            scores.append((min(score, UNCONFIDENT_MATCH_SCORE) if weak else score, candidate))
+        return scores
+
+
+_city_matcher: tuple[Hashable, CityMatcher] | None = None
+_city_matcher_lock = threading.Lock()
+
+
+def get_city_matcher(version: Hashable, load_candidates: Callable[[], Sequence[MatchCandidate]]) -> CityMatcher:
+    global _city_matcher
+    current = _city_matcher
+    if current is not None and current[0] == version:
+        return current[1]
+
+    with _city_matcher_lock:
+        if _city_matcher is None or _city_matcher[0] != version:
+            _city_matcher = (version, CityMatcher(load_candidates()))
+        return _city_matcher[1]
+
+
+def reset_city_matcher() -> None:
+    global _city_matcher
+    with _city_matcher_lock:
+        _city_matcher = None
@@ -2,8 +2,8 @@ from datetime import datetime
 from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
-from sqlalchemy import DateTime, Float, Integer, Text, func
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Boolean, DateTime, FetchedValue, Float, ForeignKey, Integer, LargeBinary, Text, false, func, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db import Base
@@ -23,8 +23,19 @@ class City(Base):
     status: Mapped[str] = mapped_column(Text, nullable=False, default="generating")
     retrieved_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     stale_after: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
-    intel: Mapped[dict | None] = mapped_column(JSONB)
-    raw_response: Mapped[str | None] = mapped_column(Text)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False
+    )
+    intel: Mapped[dict | None] = mapped_column(JSONB, deferred=True)
+    has_metro: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
+    contactless: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
+    rideshare_providers: Mapped[list[str]] = mapped_column(
+        ARRAY(Text), nullable=False, default=list, server_default=text("'{}'")
+    )
+    # Generated column maintained by Postgres from city_name, country and intel (city_search migration).
+    search_document: Mapped[str | None] = mapped_column(
+        TSVECTOR, server_default=FetchedValue(), server_onupdate=FetchedValue(), deferred=True
+    )
 
 
 class CityRequest(Base):
@@ -35,6 +46,61 @@ class CityRequest(Base):
     email: Mapped[str | None] = mapped_column(Text)
     requested_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     status: Mapped[str] = mapped_column(Text, nullable=False, default="pending")
+    normalized_input: Mapped[str | None] = mapped_column(Text)
+    matched_city_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("cities.id", ondelete="SET NULL"))
+    match_score: Mapped[float | None] = mapped_column(Float)
+
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    city_id: Mapped[int] = mapped_column(Integer, ForeignKey("cities.id", ondelete="CASCADE"), nullable=False)
+    slug: Mapped[str] = mapped_column(Text, nullable=False)
+    batch_id: Mapped[str | None] = mapped_column(Text)
+    status: Mapped[str] = mapped_column(Text, nullable=False, default="queued")
+    error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+
+class GenerationAttempt(Base):
+    __tablename__ = "generation_attempts"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    city_id: Mapped[int] = mapped_column(Integer, ForeignKey("cities.id", ondelete="CASCADE"), nullable=False)
+    attempt: Mapped[int] = mapped_column(Integer, nullable=False)
+    trigger: Mapped[str] = mapped_column(Text, nullable=False, default="manual", server_default="manual")
+    model: Mapped[str] = mapped_column(Text, nullable=False)
+    prompt_key: Mapped[str] = mapped_column(Text, nullable=False)
+    outcome: Mapped[str] = mapped_column(Text, nullable=False)
+    error: Mapped[str | None] = mapped_column(Text)
+    duration_ms: Mapped[float | None] = mapped_column(Float)
+    response_encoding: Mapped[str] = mapped_column(Text, nullable=False, default="zlib", server_default="zlib")
+    response_bytes: Mapped[int | None] = mapped_column(Integer)
+    response: Mapped[bytes | None] = mapped_column(LargeBinary, deferred=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class UrlCheck(Base):
+    __tablename__ = "url_checks"
+
+    url: Mapped[str] = mapped_column(Text, primary_key=True)
+    ok: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    reason: Mapped[str | None] = mapped_column(Text)
+    status_code: Mapped[int | None] = mapped_column(Integer)
+    checked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+
+    name: Mapped[str] = mapped_column(Text, primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    blocked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
 
 class AppLink(BaseModel):
@@ -134,6 +200,70 @@ class CityListItem(BaseModel):
     status: str
 
 
+class CitySearchResult(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    slug: str
+    city_name: str
+    country: str
+    country_code: str
+    rank: float
+
+
+class NearbyCity(BaseModel):
+    slug: str
+    city_name: str
+    country: str
+    country_code: str
+    latitude: float
+    longitude: float
+    distance_km: float
+
+
+class CityRequestMatch(BaseModel):
+    slug: str
+    city_name: str
+    country: str
+    url: str
+    score: float
+
+
+class CityRequestResult(BaseModel):
+    message: str
+    match: CityRequestMatch | None = None
+
+
+class GenerationJobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    slug: str
+    batch_id: str | None = None
+    status: str
+    city_status: str | None = None
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+
+class GenerationAttemptResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    attempt: int
+    trigger: str
+    model: str
+    prompt_key: str
+    outcome: str
+    error: str | None
+    duration_ms: float | None
+    response_bytes: int | None
+    stored_bytes: int | None
+    response: dict | None
+    created_at: datetime
+
+
 class CreateCityRequest(BaseModel):
     city_name: str
     country: str
@@ -143,6 +273,28 @@ class CreateCityRequest(BaseModel):
     slug: str | None = None
 
 
+class CreateCityBatchRequest(BaseModel):
+    cities: list[CreateCityRequest] = Field(min_length=1)
+    concurrency: int | None = Field(default=None, ge=1)
+
+
+class RejectedBatchCity(BaseModel):
+    slug: str
+    detail: str
+
+
+class GenerationBatchResponse(BaseModel):
+    batch_id: str
+    total: int
+    queued: int
+    running: int
+    succeeded: int
+    failed: int
+    concurrency: int | None = None
+    jobs: list[GenerationJobResponse]
+    rejected: list[RejectedBatchCity] = []
+
+
 class CityRequestCreate(BaseModel):
     raw_input: str = Field(min_length=1)
     email: str | None = None
@@ -0,0 +1,57 @@
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import TypeVar
+
+from starlette.requests import Request
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(*values: object) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    return encoded.decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("unexpected cursor shape")
+
+        values: list[object] = []
+        for value, value_type in zip(payload, types, strict=True):
+            if value_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif not isinstance(value, value_type) or isinstance(value, bool):
+                raise ValueError(f"expected {value_type.__name__}")
+            values.append(value)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor") from exc
+    return tuple(values)
+
+
+def page_url(request: Request, cursor: str | None) -> str:
+    if cursor is None:
+        return str(request.url.remove_query_params("cursor"))
+    return str(request.url.include_query_params(cursor=cursor))
+
+
+def next_page_headers(request: Request, cursor: str | None) -> dict[str, str]:
+    if cursor is None:
+        return {}
+    return {"Link": f'<{page_url(request, cursor)}>; rel="next"', "X-Next-Cursor": cursor}
+
+
+def split_page(rows: Sequence[T], limit: int, cursor_values: Callable[[T], tuple]) -> tuple[list[T], str | None]:
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(*cursor_values(page[-1]))
@@ -0,0 +1,55 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import RateLimitBucket
+
+
+def acquire_token(
+    db: Session,
+    name: str,
+    rate_per_second: float,
+    capacity: float,
+    now: datetime | None = None,
+) -> float:
+    now = now or datetime.now(UTC)
+    db.execute(
+        insert(RateLimitBucket)
+        .values(name=name, tokens=capacity, updated_at=now)
+        .on_conflict_do_nothing(index_elements=[RateLimitBucket.name])
+    )
+    # The row lock serializes every worker and process drawing from the same bucket.
+    bucket = db.scalars(select(RateLimitBucket).where(RateLimitBucket.name == name).with_for_update()).one()
+
+    elapsed = max(0.0, (now - bucket.updated_at).total_seconds())
+    tokens = min(capacity, bucket.tokens + elapsed * rate_per_second)
+    wait = 0.0
+    if bucket.blocked_until is not None and bucket.blocked_until > now:
+        wait = (bucket.blocked_until - now).total_seconds()
+    elif tokens >= 1:
+        tokens -= 1
+    else:
+        wait = (1 - tokens) / rate_per_second
+
+    bucket.tokens = tokens
+    bucket.updated_at = max(now, bucket.updated_at)
+    db.commit()
+    return wait
+
+
+def block_bucket(db: Session, name: str, until: datetime, now: datetime | None = None) -> None:
+    now = now or datetime.now(UTC)
+    statement = insert(RateLimitBucket).values(name=name, tokens=0, updated_at=now, blocked_until=until)
+    statement = statement.on_conflict_do_update(
+        index_elements=[RateLimitBucket.name],
+        set_={
+            "blocked_until": func.greatest(
+                func.coalesce(RateLimitBucket.blocked_until, statement.excluded.blocked_until),
+                statement.excluded.blocked_until,
+            )
+        },
+    )
+    db.execute(statement)
+    db.commit()
@@ -0,0 +1,126 @@
+import logging
+import math
+import random
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.config import Settings, get_settings
+from app.db import SessionLocal
+from app.models import City, GenerationAttempt
+
+REFRESH_TRIGGER = "refresh"
+logger = logging.getLogger(__name__)
+
+_scheduler_thread: threading.Thread | None = None
+_scheduler_stop = threading.Event()
+_scheduler_lock = threading.Lock()
+
+
+def next_stale_after(retrieved_at: datetime, settings: Settings | None = None) -> datetime:
+    settings = settings or get_settings()
+    jitter = timedelta(hours=random.uniform(0, settings.STALE_AFTER_JITTER_HOURS))
+    return retrieved_at + timedelta(days=settings.STALE_AFTER_DAYS) + jitter
+
+
+def refreshes_started_today(db: Session, now: datetime | None = None) -> int:
+    now = now or datetime.now(UTC)
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return db.scalar(
+        select(func.count())
+        .select_from(GenerationAttempt)
+        .where(
+            GenerationAttempt.trigger == REFRESH_TRIGGER,
+            GenerationAttempt.attempt == 1,
+            GenerationAttempt.created_at >= day_start,
+        )
+    )
+
+
+def refresh_batch_size(settings: Settings, used_today: int) -> int:
+    remaining = max(0, settings.REFRESH_DAILY_BUDGET - used_today)
+    # Spread the daily budget over the day's ticks instead of spending it in the first one.
+    ticks_per_day = max(1, math.floor(86400 / settings.REFRESH_INTERVAL_SECONDS))
+    per_tick = max(1, math.ceil(settings.REFRESH_DAILY_BUDGET / ticks_per_day))
+    return min(remaining, per_tick)
+
+
+def claim_stale_cities(db: Session, limit: int, lease: timedelta, now: datetime | None = None) -> list[int]:
+    if limit <= 0:
+        return []
+
+    now = now or datetime.now(UTC)
+    city_ids = db.scalars(
+        select(City.id)
+        .where(City.status == "ready", City.stale_after <= now)
+        .order_by(City.stale_after.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if city_ids:
+        # Pushing stale_after out is the lease: other workers skip these rows, and a crashed
+        # refresh is picked up again once the lease lapses.
+        db.execute(update(City).where(City.id.in_(city_ids)).values(stale_after=now + lease))
+    db.commit()
+    return list(city_ids)
+
+
+def run_refresh_tick(refresh_city: Callable[[int], bool], settings: Settings | None = None) -> int:
+    settings = settings or get_settings()
+    db = SessionLocal()
+    try:
+        batch_size = refresh_batch_size(settings, refreshes_started_today(db))
+        city_ids = claim_stale_cities(db, batch_size, timedelta(hours=settings.REFRESH_RETRY_HOURS))
+    finally:
+        db.close()
+
+    if not city_ids:
+        return 0
+
+    logger.info("Refreshing stale cities", extra={"city_count": len(city_ids)})
+    workers = max(1, settings.REFRESH_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="groundwork-refresh") as pool:
+        results = list(pool.map(refresh_city, city_ids))
+    return sum(1 for refreshed in results if refreshed)
+
+
+def run_refresh_loop(refresh_city: Callable[[int], bool], stop: threading.Event) -> None:
+    settings = get_settings()
+    # Desynchronize replicas that start together so their ticks don't line up.
+    stop.wait(random.uniform(0, settings.REFRESH_INTERVAL_SECONDS))
+    while not stop.is_set():
+        try:
+            run_refresh_tick(refresh_city, settings)
+        except Exception:  # noqa: BLE001
+            logger.exception("Stale refresh tick failed")
+        stop.wait(settings.REFRESH_INTERVAL_SECONDS)
+
+
+def start_refresh_scheduler(refresh_city: Callable[[int], bool]) -> threading.Thread:
+    global _scheduler_thread
+    with _scheduler_lock:
+        if _scheduler_thread is None or not _scheduler_thread.is_alive():
+            _scheduler_stop.clear()
+            _scheduler_thread = threading.Thread(
+                target=run_refresh_loop,
+                args=(refresh_city, _scheduler_stop),
+                name="groundwork-refresh-scheduler",
+                daemon=True,
+            )
+            _scheduler_thread.start()
+            logger.info("Started stale refresh scheduler")
+        return _scheduler_thread
+
+
+def stop_refresh_scheduler(timeout: float | None = 5.0) -> None:
+    global _scheduler_thread
+    with _scheduler_lock:
+        thread = _scheduler_thread
+        _scheduler_thread = None
+    _scheduler_stop.set()
+    if thread is not None:
+        thread.join(timeout)
@@ -0,0 +1,28 @@
+import argparse
+import logging
+import threading
+
+from app.main import run_city_refresh
+from app.refresh import run_refresh_loop, run_refresh_tick
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Regenerate Groundwork cities whose intel has gone stale.")
+    parser.add_argument("--once", action="store_true", help="Run a single refresh tick and exit.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.once:
+        refreshed = run_refresh_tick(run_city_refresh)
+        print(f"Refresh complete. refreshed={refreshed}")
+        return
+
+    stop = threading.Event()
+    try:
+        run_refresh_loop(run_city_refresh, stop)
+    except KeyboardInterrupt:
+        stop.set()
+
+
+if __name__ == "__main__":
+    main()
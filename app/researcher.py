@@ -1,16 +1,81 @@
 import json
 import logging
+import random
 import re
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from time import perf_counter, sleep
 
 import httpx
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+from app.db import SessionLocal
+from app.metrics import counter, histogram
 from app.models import CityIntel
+from app.rate_limit import acquire_token, block_bucket
+from app.response_cache import load_recorded_response, prompt_cache_key, record_response
+from app.tracing import span
+from app.url_cache import UrlCheckResult, load_url_checks, save_url_checks
 
 PERPLEXITY_URL = "https://api.perplexity.ai/chat/completions"
+PERPLEXITY_MODEL = "sonar-pro"
+PERPLEXITY_RATE_LIMIT_BUCKET = "perplexity"
 logger = logging.getLogger(__name__)
 
+PERPLEXITY_REQUEST_SECONDS = histogram(
+    "groundwork_perplexity_request_duration_seconds",
+    "Perplexity API request latency by HTTP status ('error' for transport failures).",
+    ("status",),
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0),
+)
+PERPLEXITY_RETRIES = counter(
+    "groundwork_perplexity_retries",
+    "Perplexity API requests retried after a throttle, server or transport error.",
+    ("reason",),
+)
+GENERATION_ATTEMPTS = counter(
+    "groundwork_generation_attempts",
+    "City intel generation attempts by attempt number and outcome.",
+    ("attempt", "outcome"),
+)
+GENERATION_RETRIES = counter(
+    "groundwork_generation_retries",
+    "City intel generations retried with a repair prompt.",
+    ("reason",),
+)
+URL_CHECKS = counter(
+    "groundwork_url_checks",
+    "Generated URL checks by source (network or cache) and result.",
+    ("source", "result"),
+)
+URL_CHECK_SECONDS = histogram(
+    "groundwork_url_check_duration_seconds",
+    "Latency of generated URL checks made over the network.",
+    ("result",),
+)
+
+
+@dataclass(frozen=True)
+class GenerationAttemptRecord:
+    attempt: int
+    model: str
+    prompt_key: str
+    outcome: str
+    response: dict | None
+    error: str | None
+    duration_ms: float
+
+
+_perplexity_client: httpx.Client | None = None
+_perplexity_client_lock = threading.Lock()
+
 
 def _extract_json_text(content: str) -> str:
     fenced = re.search(r"```(?:json)?\s*(.*?)```", content, flags=re.DOTALL | re.IGNORECASE)
@@ -19,43 +84,205 @@ def _extract_json_text(content: str) -> str:
     return content.strip()
 
 
-def _call_perplexity(messages: list[dict[str, str]]) -> str:
+def _build_perplexity_client(settings: Settings) -> httpx.Client:
+    return httpx.Client(
+        http2=settings.PERPLEXITY_HTTP2,
+        timeout=httpx.Timeout(
+            settings.PERPLEXITY_READ_TIMEOUT_SECONDS,
+            connect=settings.PERPLEXITY_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.PERPLEXITY_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.PERPLEXITY_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.PERPLEXITY_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+def get_perplexity_client() -> httpx.Client:
+    global _perplexity_client
+    with _perplexity_client_lock:
+        if _perplexity_client is None or _perplexity_client.is_closed:
+            _perplexity_client = _build_perplexity_client(get_settings())
+        return _perplexity_client
+
+
+def close_perplexity_client() -> None:
+    global _perplexity_client
+    with _perplexity_client_lock:
+        client = _perplexity_client
+        _perplexity_client = None
+    if client is not None:
+        client.close()
+
+
+def _parse_retry_after(value: str | None, now: datetime | None = None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - (now or datetime.now(UTC))).total_seconds())
+
+
+def _retry_delay(response: httpx.Response | None, retry: int, settings: Settings) -> float:
+    retry_after = _parse_retry_after(response.headers.get("retry-after")) if response is not None else None
+    if retry_after is not None:
+        return min(retry_after, settings.PERPLEXITY_RETRY_MAX_SECONDS)
+    backoff = min(settings.PERPLEXITY_RETRY_MAX_SECONDS, settings.PERPLEXITY_RETRY_BASE_SECONDS * 2**retry)
+    return random.uniform(0, backoff)
+
+
+def _is_retryable_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+def _wait_for_rate_limit(settings: Settings) -> None:
+    rate_per_second = settings.PERPLEXITY_REQUESTS_PER_MINUTE / 60
+    if rate_per_second <= 0:
+        return
+
+    while True:
+        db = SessionLocal()
+        try:
+            wait = acquire_token(
+                db,
+                PERPLEXITY_RATE_LIMIT_BUCKET,
+                rate_per_second,
+                max(1, settings.PERPLEXITY_RATE_LIMIT_BURST),
+            )
+        except Exception:  # noqa: BLE001
+            logger.warning("Perplexity rate limiter unavailable; sending request unthrottled", exc_info=True)
+            return
+        finally:
+            db.close()
+
+        if wait <= 0:
+            return
+        sleep(min(wait, settings.PERPLEXITY_RETRY_MAX_SECONDS))
+
+
+def _pause_rate_limit(settings: Settings, seconds: float) -> None:
+    if settings.PERPLEXITY_REQUESTS_PER_MINUTE <= 0 or seconds <= 0:
+        return
+
+    db = SessionLocal()
+    try:
+        block_bucket(db, PERPLEXITY_RATE_LIMIT_BUCKET, datetime.now(UTC) + timedelta(seconds=seconds))
+    except Exception:  # noqa: BLE001
+        logger.warning("Perplexity rate limiter pause failed", exc_info=True)
+    finally:
+        db.close()
+
+
+def _perplexity_error_message(response: httpx.Response) -> str:
+    request_id = response.headers.get("x-request-id") or response.headers.get("request-id")
+    body = (response.text or "").strip()
+    if len(body) > 1000:
+        body = f"{body[:1000]}...[truncated]"
+
+    message = f"Perplexity API error {response.status_code}"
+    if request_id:
+        message = f"{message} (request_id={request_id})"
+    if body:
+        message = f"{message}: {body}"
+    return message
+
+
+def _post_perplexity(payload: dict) -> dict:
     settings = get_settings()
     headers = {
         "Authorization": f"Bearer {settings.PERPLEXITY_API_KEY}",
         "Content-Type": "application/json",
     }
-    payload = {
-        "model": "sonar-pro",
-        "temperature": 0.1,
-        "messages": messages,
-    }
 
-    with httpx.Client(timeout=60) as client:
+    client = get_perplexity_client()
+    max_retries = max(0, settings.PERPLEXITY_MAX_RETRIES)
+    retry = 0
+    while True:
+        with span("perplexity.rate_limit_wait"):
+            _wait_for_rate_limit(settings)
+        start_time = perf_counter()
         try:
-            response = client.post(PERPLEXITY_URL, headers=headers, json=payload)
+            with span("perplexity.request", retry=retry) as current:
+                response = client.post(PERPLEXITY_URL, headers=headers, json=payload)
+                current.set_attribute("status_code", response.status_code)
+            PERPLEXITY_REQUEST_SECONDS.observe(perf_counter() - start_time, status=response.status_code)
             response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as exc:
             status_code = exc.response.status_code
-            request_id = exc.response.headers.get("x-request-id") or exc.response.headers.get("request-id")
-            body = (exc.response.text or "").strip()
-            if len(body) > 1000:
-                body = f"{body[:1000]}...[truncated]"
-
-            message = f"Perplexity API error {status_code}"
-            if request_id:
-                message = f"{message} (request_id={request_id})"
-            if body:
-                message = f"{message}: {body}"
-
-            logger.error(message)
-            raise RuntimeError(message) from exc
+            if not _is_retryable_status(status_code) or retry >= max_retries:
+                message = _perplexity_error_message(exc.response)
+                logger.error(message)
+                raise RuntimeError(message) from exc
+
+            delay = _retry_delay(exc.response, retry, settings)
+            PERPLEXITY_RETRIES.inc(reason=status_code)
+            if status_code == 429:
+                # Every worker sharing the bucket backs off, not just the one that got throttled.
+                _pause_rate_limit(settings, delay)
+            logger.warning(
+                "Perplexity request throttled; retrying",
+                extra={"status_code": status_code, "retry": retry + 1, "delay_seconds": round(delay, 2)},
+            )
+        except httpx.TransportError as exc:
+            PERPLEXITY_REQUEST_SECONDS.observe(perf_counter() - start_time, status="error")
+            if retry >= max_retries:
+                message = f"Perplexity request failed: {exc}"
+                logger.exception(message)
+                raise RuntimeError(message) from exc
+
+            delay = _retry_delay(None, retry, settings)
+            PERPLEXITY_RETRIES.inc(reason="transport_error")
+            logger.warning(
+                "Perplexity request failed; retrying",
+                extra={"error": str(exc), "retry": retry + 1, "delay_seconds": round(delay, 2)},
+            )
         except httpx.HTTPError as exc:
             message = f"Perplexity request failed: {exc}"
             logger.exception(message)
             raise RuntimeError(message) from exc
 
-    data = response.json()
+        retry += 1
+        sleep(delay)
+
+
+def _call_perplexity(messages: list[dict[str, str]]) -> dict:
+    settings = get_settings()
+    payload = {
+        "model": PERPLEXITY_MODEL,
+        "temperature": 0.1,
+        "messages": messages,
+    }
+
+    mode = settings.PERPLEXITY_RESPONSE_CACHE_MODE
+    data: dict | None = None
+    if mode != "passthrough":
+        cache_key = prompt_cache_key(PERPLEXITY_MODEL, messages)
+        data = load_recorded_response(settings.PERPLEXITY_RESPONSE_CACHE_DIR, cache_key)
+        if data is None and mode == "replay":
+            raise RuntimeError(
+                f"No recorded Perplexity response for prompt {cache_key} in {settings.PERPLEXITY_RESPONSE_CACHE_DIR}"
+            )
+
+    if data is None:
+        data = _post_perplexity(payload)
+        if mode == "record":
+            record_response(settings.PERPLEXITY_RESPONSE_CACHE_DIR, cache_key, data)
+
+    return data
+
+
+def _completion_content(data: dict) -> str:
     choices = data.get("choices") or []
     if not choices:
         raise ValueError("Perplexity returned no choices.")
@@ -113,32 +340,116 @@ def _is_acceptable_status_code(status_code: int) -> bool:
     return status_code in {401, 403, 429}
 
 
-def _check_url(client: httpx.Client, url: str) -> tuple[bool, str | None]:
+def _check_url(client: httpx.Client, url: str) -> UrlCheckResult:
     try:
         parsed = httpx.URL(url)
     except Exception:  # noqa: BLE001
-        return False, "Invalid URL format"
+        return False, "Invalid URL format", None
 
     if parsed.scheme not in {"http", "https"} or not parsed.host:
-        return False, "Unsupported URL scheme or missing host"
+        return False, "Unsupported URL scheme or missing host", None
 
     for method in ("HEAD", "GET"):
         try:
             response = client.request(method, url)
         except httpx.HTTPError as exc:
-            return False, f"{exc.__class__.__name__}: {exc}"
+            return False, f"{exc.__class__.__name__}: {exc}", None
 
         status_code = response.status_code
         if method == "HEAD" and status_code in {405, 501}:
             continue
 
         if status_code in {404, 410}:
-            return False, f"HTTP {status_code}"
+            return False, f"HTTP {status_code}", status_code
         if _is_acceptable_status_code(status_code):
-            return True, None
-        return False, f"HTTP {status_code}"
+            return True, None, status_code
+        return False, f"HTTP {status_code}", status_code
 
-    return False, "No supported HTTP method"
+    return False, "No supported HTTP method", None
+
+
+def _url_host(url: str) -> str:
+    try:
+        return (httpx.URL(url).host or "").lower()
+    except Exception:  # noqa: BLE001
+        return ""
+
+
+def _check_urls_concurrently(
+    client: httpx.Client,
+    urls: list[str],
+    max_concurrency: int,
+    per_host_concurrency: int,
+) -> dict[str, UrlCheckResult]:
+    queues_by_host: dict[str, deque[str]] = {}
+    for url in urls:
+        queues_by_host.setdefault(_url_host(url), deque()).append(url)
+
+    # Each host gets up to per_host_concurrency lanes draining its own queue, so a
+    # host with many links never blocks workers that could be checking other hosts.
+    # Busiest hosts are scheduled first because they bound the total wall-clock time.
+    lanes: list[deque[str]] = []
+    for queue in sorted(queues_by_host.values(), key=len, reverse=True):
+        lanes.extend([queue] * min(per_host_concurrency, len(queue)))
+
+    results: dict[str, UrlCheckResult] = {}
+
+    def drain(queue: deque[str]) -> None:
+        while True:
+            try:
+                url = queue.popleft()
+            except IndexError:
+                return
+            start_time = perf_counter()
+            with span("check_url", url=url) as current:
+                results[url] = _check_url(client, url)
+                current.set_attribute("status_code", results[url][2])
+            result = "ok" if results[url][0] else "failed"
+            URL_CHECK_SECONDS.observe(perf_counter() - start_time, result=result)
+            URL_CHECKS.inc(source="network", result=result)
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_concurrency, len(lanes))),
+        thread_name_prefix="groundwork-url-check",
+    ) as executor:
+        # Each lane runs in a copy of the caller's context so check_url spans join the current trace.
+        for future in [executor.submit(copy_context().run, drain, queue) for queue in lanes]:
+            future.result()
+
+    return results
+
+
+def _load_cached_url_checks(urls: list[str], settings: Settings) -> dict[str, UrlCheckResult]:
+    if not settings.URL_VERIFICATION_CACHE_ENABLED:
+        return {}
+
+    db = SessionLocal()
+    try:
+        return load_url_checks(
+            db,
+            urls,
+            ok_ttl=timedelta(hours=settings.URL_VERIFICATION_CACHE_OK_TTL_HOURS),
+            fail_ttl=timedelta(hours=settings.URL_VERIFICATION_CACHE_FAIL_TTL_HOURS),
+        )
+    except Exception:  # noqa: BLE001
+        logger.warning("URL verification cache lookup failed; checking all URLs", exc_info=True)
+        return {}
+    finally:
+        db.close()
+
+
+def _store_url_checks(results: dict[str, UrlCheckResult], settings: Settings) -> None:
+    if not settings.URL_VERIFICATION_CACHE_ENABLED or not results:
+        return
+
+    db = SessionLocal()
+    try:
+        save_url_checks(db, results)
+    except Exception:  # noqa: BLE001
+        db.rollback()
+        logger.warning("URL verification cache write failed", exc_info=True)
+    finally:
+        db.close()
 
 
 def _validate_intel_urls(intel: CityIntel, timeout_seconds: float) -> dict[str, str]:
@@ -147,13 +458,29 @@ def _validate_intel_urls(intel: CityIntel, timeout_seconds: float) -> dict[str,
     if not urls:
         return invalid
 
-    with httpx.Client(
-        timeout=timeout_seconds,
-        follow_redirects=True,
-        headers={"User-Agent": "groundwork-link-verifier/1.0"},
-    ) as client:
+    with span("validate_intel_urls", url_count=len(urls)) as current:
+        settings = get_settings()
+        max_concurrency = max(1, settings.URL_VERIFICATION_MAX_CONCURRENCY)
+        per_host_concurrency = max(1, settings.URL_VERIFICATION_PER_HOST_CONCURRENCY)
+
+        results = _load_cached_url_checks(urls, settings)
+        for is_valid, _, _ in results.values():
+            URL_CHECKS.inc(source="cache", result="ok" if is_valid else "failed")
+        pending = [url for url in urls if url not in results]
+        current.set_attribute("cached_count", len(results))
+        if pending:
+            with httpx.Client(
+                timeout=timeout_seconds,
+                follow_redirects=True,
+                headers={"User-Agent": "groundwork-link-verifier/1.0"},
+                limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            ) as client:
+                checked = _check_urls_concurrently(client, pending, max_concurrency, per_host_concurrency)
+            _store_url_checks(checked, settings)
+            results.update(checked)
+
         for url in urls:
-            is_valid, reason = _check_url(client, url)
+            is_valid, reason, _ = results[url]
             if not is_valid:
                 invalid[url] = reason or "Unreachable"
 
@@ -224,7 +551,20 @@ def _load_mock_intel() -> CityIntel | None:
         raise RuntimeError(f"Invalid PERPLEXITY_MOCK_RESPONSE_FILE at {mock_response_file}: {exc}") from exc
 
 
-def generate_intel(city_name: str, country: str) -> CityIntel:
+def generate_intel(
+    city_name: str,
+    country: str,
+    on_attempt: Callable[[GenerationAttemptRecord], None] | None = None,
+) -> CityIntel:
+    with span("generate_intel", city=city_name, country=country):
+        return _generate_intel(city_name, country, on_attempt)
+
+
+def _generate_intel(
+    city_name: str,
+    country: str,
+    on_attempt: Callable[[GenerationAttemptRecord], None] | None = None,
+) -> CityIntel:
     mock_intel = _load_mock_intel()
     if mock_intel is not None:
         return mock_intel
@@ -244,14 +584,42 @@ def generate_intel(city_name: str, country: str) -> CityIntel:
     last_error: Exception | None = None
 
     for attempt in range(2):
-        raw_content = _call_perplexity(messages)
+        start_time = perf_counter()
+        prompt_key = prompt_cache_key(PERPLEXITY_MODEL, messages)
+        data: dict | None = None
+
+        def report(outcome: str, error: Exception | str | None = None) -> None:
+            GENERATION_ATTEMPTS.inc(attempt=attempt + 1, outcome=outcome)
+            if on_attempt is None:
+                return
+            on_attempt(
+                GenerationAttemptRecord(
+                    attempt=attempt + 1,
+                    model=PERPLEXITY_MODEL,
+                    prompt_key=prompt_key,
+                    outcome=outcome,
+                    response=data,
+                    error=str(error) if error is not None else None,
+                    duration_ms=round((perf_counter() - start_time) * 1000, 2),
+                )
+            )
+
+        try:
+            with span("perplexity.call", attempt=attempt + 1, prompt_key=prompt_key):
+                data = _call_perplexity(messages)
+            raw_content = _completion_content(data)
+        except Exception as exc:
+            report("request_failed" if data is None else "invalid_output", exc)
+            raise
 
         try:
             parsed = json.loads(_extract_json_text(raw_content))
             intel = CityIntel.model_validate(parsed)
         except Exception as exc:  # noqa: BLE001
             last_error = exc
+            report("invalid_output", exc)
             if attempt == 0:
+                GENERATION_RETRIES.inc(reason="invalid_output")
                 messages.append({"role": "assistant", "content": raw_content})
                 messages.append(
                     {
@@ -270,12 +638,15 @@ def generate_intel(city_name: str, country: str) -> CityIntel:
             if invalid_urls:
                 sample = "; ".join(f"{url} ({reason})" for url, reason in list(invalid_urls.items())[:3])
                 last_error = ValueError(f"Generated intel contains invalid URLs: {sample}")
+                report("invalid_urls", last_error)
                 if attempt == 0:
+                    GENERATION_RETRIES.inc(reason="invalid_urls")
                     messages.append({"role": "assistant", "content": raw_content})
                     messages.append({"role": "user", "content": _invalid_urls_retry_prompt(invalid_urls)})
                     continue
                 break
 
+        report("accepted")
         return intel
 
     raise RuntimeError(f"Failed to generate valid city intel after retry: {last_error}")
@@ -0,0 +1,43 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+def prompt_cache_key(model: str, messages: list[dict[str, str]]) -> str:
+    canonical = json.dumps(
+        {"model": model, "messages": messages},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _response_path(directory: Path, key: str) -> Path:
+    return directory / key[:2] / f"{key}.json"
+
+
+def load_recorded_response(directory: str | Path, key: str) -> dict | None:
+    path = _response_path(Path(directory), key)
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+def record_response(directory: str | Path, key: str, data: dict) -> Path:
+    path = _response_path(Path(directory), key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write-then-rename keeps concurrent recorders from ever exposing a partial file.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, ensure_ascii=False)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path
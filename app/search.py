@@ -0,0 +1,60 @@
+import re
+
+from sqlalchemy import Float, Row, Select, cast, func, literal, or_, select, text
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+
+from app.models import City
+
+SEARCH_CONFIG = "simple"
+SEARCH_TERM_PATTERN = re.compile(r"\w+")
+MAX_SEARCH_TERMS = 8
+
+_trigram_support: dict[str, bool] = {}
+
+
+def search_terms(query: str) -> list[str]:
+    return SEARCH_TERM_PATTERN.findall(query.lower())[:MAX_SEARCH_TERMS]
+
+
+def prefix_tsquery(terms: list[str]) -> str:
+    # Terms are \w+ only, so they cannot inject tsquery operators; ":*" makes partial words match while typing.
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def trigram_available(db: Session) -> bool:
+    key = str(db.get_bind().engine.url)
+    if key not in _trigram_support:
+        _trigram_support[key] = bool(db.scalar(text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")))
+    return _trigram_support[key]
+
+
+def search_query(db: Session, query: str, limit: int) -> Select | None:
+    terms = search_terms(query)
+    if not terms:
+        return None
+
+    tsquery = func.to_tsquery(cast(literal(SEARCH_CONFIG), REGCONFIG), prefix_tsquery(terms))
+    rank = func.ts_rank_cd(City.search_document, tsquery)
+    match = City.search_document.op("@@")(tsquery)
+
+    if trigram_available(db):
+        phrase = " ".join(terms)
+        name = func.lower(City.city_name)
+        match = or_(match, name.op("%")(phrase))
+        rank = func.greatest(rank, func.similarity(name, phrase).cast(Float))
+
+    ranked = rank.label("rank")
+    return (
+        select(City.slug, City.city_name, City.country, City.country_code, ranked)
+        .where(City.status == "ready", match)
+        .order_by(ranked.desc(), City.retrieved_at.desc(), City.city_name.asc())
+        .limit(limit)
+    )
+
+
+def search_cities(db: Session, query: str, limit: int) -> list[Row]:
+    statement = search_query(db, query, limit)
+    if statement is None:
+        return []
+    return db.execute(statement).all()
@@ -1,5 +1,9 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from fastapi import HTTPException
 
+from app.config import get_settings
 from app.db import SessionLocal
 from app.main import create_city_profile
 from app.models import CreateCityRequest
@@ -38,33 +42,42 @@ CITIES = [
 ]
 
 
-def main() -> None:
+def seed_city(city: dict) -> tuple[str, str]:
     db = SessionLocal()
     try:
-        created = 0
-        skipped = 0
-        failed = 0
-
-        for city in CITIES:
-            try:
-                create_city_profile(db, CreateCityRequest(**city))
-                created += 1
-                print(f"Created: {city['city_name']}")
-            except HTTPException as exc:
-                if exc.status_code == 409:
-                    skipped += 1
-                    print(f"Skipped (already exists): {city['city_name']}")
-                else:
-                    failed += 1
-                    print(f"Failed ({city['city_name']}): {exc.detail}")
-            except Exception as exc:  # noqa: BLE001
-                failed += 1
-                print(f"Failed ({city['city_name']}): {exc}")
-
-        print(f"Seed complete. created={created} skipped={skipped} failed={failed}")
+        create_city_profile(db, CreateCityRequest(**city))
+        return "created", f"Created: {city['city_name']}"
+    except HTTPException as exc:
+        if exc.status_code == 409:
+            return "skipped", f"Skipped (already exists): {city['city_name']}"
+        return "failed", f"Failed ({city['city_name']}): {exc.detail}"
+    except Exception as exc:  # noqa: BLE001
+        return "failed", f"Failed ({city['city_name']}): {exc}"
     finally:
         db.close()
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed the Groundwork catalog with a starter set of cities.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=get_settings().GENERATION_BATCH_CONCURRENCY,
+        help="Number of cities to generate in parallel.",
+    )
+    args = parser.parse_args()
+
+    counts = {"created": 0, "skipped": 0, "failed": 0}
+    total = len(CITIES)
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency), thread_name_prefix="groundwork-seed") as pool:
+        futures = [pool.submit(seed_city, city) for city in CITIES]
+        for done, future in enumerate(as_completed(futures), start=1):
+            outcome, message = future.result()
+            counts[outcome] += 1
+            print(f"[{done}/{total}] {message}")
+
+    print(f"Seed complete. created={counts['created']} skipped={counts['skipped']} failed={counts['failed']}")
+
+
 if __name__ == "__main__":
     main()
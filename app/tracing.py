@@ -0,0 +1,150 @@
+import json
+import logging
+import secrets
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Protocol, TextIO
+
+from app.config import get_settings
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_time: float
+    duration_ms: float | None = None
+    status: str = "ok"
+    error: str | None = None
+    attributes: dict[str, object] = field(default_factory=dict)
+
+    def set_attribute(self, key: str, value: object) -> None:
+        self.attributes[key] = value
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+
+class NoopSpanExporter:
+    def export(self, span: Span) -> None:
+        return None
+
+
+class ConsoleSpanExporter:
+    def __init__(self, stream: TextIO | None = None):
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        attributes = " ".join(f"{key}={value}" for key, value in span.attributes.items())
+        line = (
+            f"[trace {span.trace_id[:8]}] {span.name} {span.duration_ms:.1f}ms {span.status}"
+            f" span={span.span_id} parent={span.parent_id or '-'}"
+        )
+        if attributes:
+            line = f"{line} {attributes}"
+        if span.error:
+            line = f"{line} error={span.error}"
+        with self._lock:
+            print(line, file=self._stream or sys.stderr, flush=True)
+
+
+class JsonlSpanExporter:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(asdict(span), default=str, separators=(",", ":"))
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(f"{line}\n")
+
+
+_current_span: ContextVar[Span | None] = ContextVar("groundwork_current_span", default=None)
+_exporter: SpanExporter | None = None
+_exporter_lock = threading.Lock()
+_log_record_factory_installed = False
+
+
+def build_span_exporter() -> SpanExporter:
+    settings = get_settings()
+    if settings.TRACING_EXPORTER == "console":
+        return ConsoleSpanExporter()
+    if settings.TRACING_EXPORTER == "jsonl":
+        return JsonlSpanExporter(settings.TRACING_JSONL_PATH)
+    return NoopSpanExporter()
+
+
+def get_span_exporter() -> SpanExporter:
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = build_span_exporter()
+        return _exporter
+
+
+def set_span_exporter(exporter: SpanExporter | None) -> None:
+    global _exporter
+    with _exporter_lock:
+        _exporter = exporter
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, **attributes: object) -> Iterator[Span]:
+    parent = _current_span.get()
+    current = Span(
+        name=name,
+        trace_id=parent.trace_id if parent else secrets.token_hex(16),
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id if parent else None,
+        start_time=time.time(),
+        attributes=dict(attributes),
+    )
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as exc:
+        current.status = "error"
+        current.error = f"{exc.__class__.__name__}: {exc}"
+        raise
+    finally:
+        current.duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        _current_span.reset(token)
+        try:
+            get_span_exporter().export(current)
+        except Exception:  # noqa: BLE001
+            logging.getLogger(__name__).warning("Span export failed", exc_info=True)
+
+
+def install_log_record_factory() -> None:
+    global _log_record_factory_installed
+    if _log_record_factory_installed:
+        return
+
+    previous_factory = logging.getLogRecordFactory()
+
+    def record_factory(*args, **kwargs) -> logging.LogRecord:
+        record = previous_factory(*args, **kwargs)
+        active = _current_span.get()
+        record.trace_id = active.trace_id if active else None
+        record.span_id = active.span_id if active else None
+        return record
+
+    logging.setLogRecordFactory(record_factory)
+    _log_record_factory_installed = True
@@ -0,0 +1,55 @@
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import UrlCheck
+
+UrlCheckResult = tuple[bool, str | None, int | None]
+
+
+def load_url_checks(
+    db: Session,
+    urls: Iterable[str],
+    ok_ttl: timedelta,
+    fail_ttl: timedelta,
+    now: datetime | None = None,
+) -> dict[str, UrlCheckResult]:
+    url_list = list(urls)
+    if not url_list:
+        return {}
+
+    now = now or datetime.now(UTC)
+    rows = db.scalars(select(UrlCheck).where(UrlCheck.url.in_(url_list))).all()
+
+    fresh: dict[str, UrlCheckResult] = {}
+    for row in rows:
+        ttl = ok_ttl if row.ok else fail_ttl
+        if row.checked_at + ttl > now:
+            fresh[row.url] = (row.ok, row.reason, row.status_code)
+    return fresh
+
+
+def save_url_checks(db: Session, results: dict[str, UrlCheckResult], checked_at: datetime | None = None) -> None:
+    if not results:
+        return
+
+    checked_at = checked_at or datetime.now(UTC)
+    rows = [
+        {"url": url, "ok": ok, "reason": reason, "status_code": status_code, "checked_at": checked_at}
+        for url, (ok, reason, status_code) in results.items()
+    ]
+    statement = insert(UrlCheck).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[UrlCheck.url],
+        set_={
+            "ok": statement.excluded.ok,
+            "reason": statement.excluded.reason,
+            "status_code": statement.excluded.status_code,
+            "checked_at": statement.excluded.checked_at,
+        },
+    )
+    db.execute(statement)
+    db.commit()
@@ -0,0 +1,122 @@
+import argparse
+import json
+import math
+import random
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.main import intel_summary_columns
+from app.models import City, CityIntel, CityRequest
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+SLUG_PREFIX = "bench-"
+REQUEST_PREFIX = "bench request"
+CATALOG_SIZES = (100, 1_000, 10_000, 100_000)
+COUNTRIES = (
+    ("Spain", "ES"),
+    ("United Kingdom", "GB"),
+    ("Italy", "IT"),
+    ("United States", "US"),
+    ("Latvia", "LV"),
+    ("Japan", "JP"),
+    ("Brazil", "BR"),
+    ("Kenya", "KE"),
+)
+SYLLABLES = ("ba", "ro", "ne", "li", "sa", "ko", "ta", "mi", "du", "ve", "pra", "gor", "len", "vik", "sto", "ham")
+
+
+def bench_slug(index: int) -> str:
+    return f"{SLUG_PREFIX}{index:06d}"
+
+
+def load_fixture_intel(fixtures_dir: Path = FIXTURES_DIR) -> list[dict]:
+    return [
+        CityIntel.model_validate(json.loads(path.read_text(encoding="utf-8"))).model_dump()
+        for path in sorted(fixtures_dir.glob("*.json"))
+    ]
+
+
+def synthetic_city_name(index: int) -> str:
+    parts = []
+    value = index
+    for _ in range(3):
+        value, remainder = divmod(value, len(SYLLABLES))
+        parts.append(SYLLABLES[remainder])
+    return f"{''.join(parts).capitalize()} {index}"
+
+
+def synthetic_cities(count: int, intel_templates: list[dict], seed: int = 7) -> Iterator[dict]:
+    rng = random.Random(seed)
+    summaries = [intel_summary_columns(CityIntel.model_validate(intel)) for intel in intel_templates]
+    now = datetime.now(UTC)
+    for index in range(count):
+        template = index % len(intel_templates)
+        country, country_code = COUNTRIES[index % len(COUNTRIES)]
+        # Spread points over the sphere so /cities/near and the KD-tree see a realistic layout.
+        latitude = math.degrees(math.asin(rng.uniform(-1, 1)))
+        yield {
+            "slug": bench_slug(index),
+            "city_name": synthetic_city_name(index),
+            "country": country,
+            "country_code": country_code,
+            "latitude": round(latitude, 4),
+            "longitude": round(rng.uniform(-180, 180), 4),
+            "status": "ready",
+            "intel": intel_templates[template],
+            "retrieved_at": now - timedelta(seconds=index),
+            "stale_after": now + timedelta(days=30),
+            **summaries[template],
+        }
+
+
+def clear_catalog(db: Session) -> None:
+    db.execute(delete(CityRequest).where(CityRequest.raw_input.startswith(REQUEST_PREFIX)))
+    db.execute(delete(City).where(City.slug.startswith(SLUG_PREFIX)))
+    db.commit()
+
+
+def seed_catalog(db: Session, count: int, batch_size: int = 1_000) -> int:
+    clear_catalog(db)
+    batch: list[dict] = []
+    inserted = 0
+    for city in synthetic_cities(count, load_fixture_intel()):
+        batch.append(city)
+        if len(batch) >= batch_size:
+            db.execute(insert(City), batch)
+            db.commit()
+            inserted += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(City), batch)
+        db.commit()
+        inserted += len(batch)
+    return inserted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed Postgres with a synthetic city catalog built from test fixtures.")
+    parser.add_argument("--count", type=int, default=1_000, help=f"Number of cities, e.g. {CATALOG_SIZES}.")
+    parser.add_argument("--batch-size", type=int, default=1_000, help="Rows per INSERT batch.")
+    parser.add_argument("--clear", action="store_true", help="Only remove previously seeded benchmark rows.")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.clear:
+            clear_catalog(db)
+            print("Removed synthetic benchmark catalog.")
+            return
+        inserted = seed_catalog(db, args.count, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(f"Seeded {inserted} synthetic cities (slugs {bench_slug(0)}..{bench_slug(inserted - 1)}).")
+
+
+if __name__ == "__main__":
+    main()
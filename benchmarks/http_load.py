@@ -0,0 +1,372 @@
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+
+from benchmarks.catalog import REQUEST_PREFIX, bench_slug
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8000"
+DEFAULT_CONCURRENCY = (10, 50)
+DEFAULT_DURATION_SECONDS = 10.0
+DEFAULT_WARMUP_SECONDS = 2.0
+DEFAULT_TOLERANCE = 0.15
+RSS_SAMPLE_INTERVAL_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    path: Callable[[random.Random, int], str]
+    body: Callable[[int], dict] | None = None
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("index", "GET", lambda rng, size: "/"),
+        Scenario("cities", "GET", lambda rng, size: "/cities"),
+        Scenario("city_detail", "GET", lambda rng, size: f"/cities/{bench_slug(rng.randrange(size))}"),
+        Scenario("city_page", "GET", lambda rng, size: f"/{bench_slug(rng.randrange(size))}"),
+        Scenario(
+            "create_request",
+            "POST",
+            lambda rng, size: "/requests",
+            lambda n: {"raw_input": f"{REQUEST_PREFIX} {n}"},
+        ),
+    )
+}
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float | None:
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: list[float], statuses: Counter, errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    completed = len(ordered)
+
+    def ms(value: float | None) -> float | None:
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        "requests": completed + errors,
+        "errors": errors + sum(count for code, count in statuses.items() if int(code) >= 400),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "throughput_rps": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": ms(sum(ordered) / completed) if completed else None,
+            "p50": ms(percentile(ordered, 0.50)),
+            "p95": ms(percentile(ordered, 0.95)),
+            "p99": ms(percentile(ordered, 0.99)),
+            "max": ms(ordered[-1]) if ordered else None,
+        },
+    }
+
+
+def read_rss_bytes(pid: int) -> int | None:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+async def sample_peak_rss(pid: int, peak: list[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        rss = read_rss_bytes(pid)
+        if rss is not None and rss > peak[0]:
+            peak[0] = rss
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_SAMPLE_INTERVAL_SECONDS)
+        except TimeoutError:
+            pass
+
+
+async def run_scenario(
+    base_url: str,
+    scenario: Scenario,
+    catalog_size: int,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    server_pid: int | None = None,
+    timeout: float = 30.0,
+) -> dict:
+    rng = random.Random(f"{scenario.name}:{concurrency}")
+    sequence = itertools.count()
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    errors = 0
+    measuring = False
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+
+        async def worker(deadline: float) -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                path = scenario.path(rng, catalog_size)
+                body = scenario.body(next(sequence)) if scenario.body else None
+                started = time.perf_counter()
+                try:
+                    response = await client.request(scenario.method, path, json=body)
+                except httpx.HTTPError:
+                    if measuring:
+                        errors += 1
+                    continue
+                if measuring:
+                    latencies.append(time.perf_counter() - started)
+                    statuses[response.status_code] += 1
+
+        if warmup > 0:
+            deadline = time.perf_counter() + warmup
+            await asyncio.gather(*(worker(deadline) for _ in range(concurrency)))
+
+        peak = [read_rss_bytes(server_pid) or 0] if server_pid else [0]
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_peak_rss(server_pid, peak, stop)) if server_pid else None
+
+        measuring = True
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(worker(deadline) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        if sampler:
+            await sampler
+
+    result = {"endpoint": scenario.name, "concurrency": concurrency, "duration_seconds": round(elapsed, 2)}
+    result.update(summarize(latencies, statuses, errors, elapsed))
+    result["peak_rss_mb"] = round(peak[0] / (1024 * 1024), 1) if server_pid and peak[0] else None
+    return result
+
+
+def result_key(result: dict) -> tuple[str, int]:
+    return result["endpoint"], result["concurrency"]
+
+
+def compare_to_baseline(results: list[dict], baseline: list[dict], tolerance: float = DEFAULT_TOLERANCE) -> list[dict]:
+    previous = {result_key(result): result for result in baseline}
+    comparisons = []
+    for result in results:
+        before = previous.get(result_key(result))
+        if before is None:
+            continue
+        rps_change = relative_change(before["throughput_rps"], result["throughput_rps"])
+        p95_change = relative_change(before["latency_ms"]["p95"], result["latency_ms"]["p95"])
+        regressed = (rps_change is not None and rps_change < -tolerance) or (
+            p95_change is not None and p95_change > tolerance
+        )
+        comparisons.append(
+            {
+                "endpoint": result["endpoint"],
+                "concurrency": result["concurrency"],
+                "throughput_change": rps_change,
+                "p95_change": p95_change,
+                "regressed": regressed,
+            }
+        )
+    return comparisons
+
+
+def relative_change(before: float | None, after: float | None) -> float | None:
+    if not before or after is None:
+        return None
+    return round((after - before) / before, 4)
+
+
+def format_change(change: float | None) -> str:
+    return f"{change:+.1%}" if change is not None else "n/a"
+
+
+def git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def wait_for_server(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy within {timeout:.0f}s")
+
+
+def spawn_server(base_url: str) -> subprocess.Popen:
+    url = httpx.URL(base_url)
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            url.host,
+            "--port",
+            str(url.port or 8000),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ]
+    )
+    try:
+        wait_for_server(base_url)
+    except RuntimeError:
+        process.terminate()
+        raise
+    return process
+
+
+def print_result(result: dict) -> None:
+    latency = result["latency_ms"]
+    rss = f"{result['peak_rss_mb']}MB" if result["peak_rss_mb"] is not None else "-"
+    print(
+        f"{result['endpoint']:<15} c={result['concurrency']:<4} {result['throughput_rps']:>9.1f} rps "
+        f"p50={latency['p50']}ms p95={latency['p95']}ms p99={latency['p99']}ms "
+        f"errors={result['errors']} rss={rss}",
+        flush=True,
+    )
+
+
+def parse_concurrency(value: str) -> tuple[int, ...]:
+    levels = tuple(int(part) for part in value.split(",") if part.strip())
+    if not levels or any(level < 1 for level in levels):
+        raise argparse.ArgumentTypeError("concurrency must be a comma-separated list of positive integers")
+    return levels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive the public endpoints at fixed concurrency and record latency.")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--catalog-size", type=int, required=True, help="Number of seeded benchmark cities.")
+    parser.add_argument("--seed", action="store_true", help="Seed the synthetic catalog before running.")
+    parser.add_argument(
+        "--endpoints",
+        default=",".join(SCENARIOS),
+        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}.",
+    )
+    parser.add_argument("--concurrency", type=parse_concurrency, default=DEFAULT_CONCURRENCY, help="e.g. 10,50,200")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION_SECONDS, help="Measured seconds per run.")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP_SECONDS, help="Unmeasured seconds per run.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--server-pid", type=int, help="PID of a running server to sample peak RSS from.")
+    parser.add_argument("--spawn-server", action="store_true", help="Start uvicorn for the run and sample its RSS.")
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results/http_load.json"))
+    parser.add_argument("--baseline", type=Path, help="Earlier results file to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Relative throughput drop or p95 increase counted as a regression.",
+    )
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit non-zero if any run regressed.")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+
+    if args.seed:
+        from app.db import SessionLocal
+        from benchmarks.catalog import seed_catalog
+
+        db = SessionLocal()
+        try:
+            seed_catalog(db, args.catalog_size)
+        finally:
+            db.close()
+
+    server = spawn_server(args.base_url) if args.spawn_server else None
+    server_pid = server.pid if server else args.server_pid
+    results = []
+    try:
+        for name in names:
+            for concurrency in args.concurrency:
+                result = asyncio.run(
+                    run_scenario(
+                        args.base_url,
+                        SCENARIOS[name],
+                        args.catalog_size,
+                        concurrency,
+                        args.duration,
+                        args.warmup,
+                        server_pid=server_pid,
+                        timeout=args.timeout,
+                    )
+                )
+                print_result(result)
+                results.append(result)
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "git_commit": git_commit(),
+            "base_url": args.base_url,
+            "catalog_size": args.catalog_size,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        comparisons = compare_to_baseline(results, baseline["results"], args.tolerance)
+        report["baseline"] = {"path": str(args.baseline), "meta": baseline.get("meta"), "comparisons": comparisons}
+        regressions = [comparison for comparison in comparisons if comparison["regressed"]]
+        for comparison in regressions:
+            print(
+                f"REGRESSION {comparison['endpoint']} c={comparison['concurrency']}: "
+                f"throughput {format_change(comparison['throughput_change'])}, "
+                f"p95 {format_change(comparison['p95_change'])}"
+            )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {args.output}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
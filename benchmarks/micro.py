@@ -0,0 +1,272 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from app.export import build_export_request
+from app.main import (
+    CITY_CARD_COLUMNS,
+    build_city_card,
+    city_page_context,
+    index_page_context,
+    intel_summary_columns,
+    templates,
+    to_city_response,
+)
+from app.models import City, CityIntel
+from benchmarks.catalog import FIXTURES_DIR, bench_slug, synthetic_cities
+from benchmarks.http_load import DEFAULT_TOLERANCE, format_change, git_commit, relative_change
+
+DEFAULT_SCALES = (10, 50)
+DEFAULT_CARD_COUNTS = (100, 1_000, 10_000)
+DEFAULT_MIN_TIME_SECONDS = 0.2
+DEFAULT_REPEAT = 5
+NAMED_FIELDS = ("name", "provider", "method", "source")
+
+CardRow = namedtuple("CardRow", [column.key for column in CITY_CARD_COLUMNS])
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    payload: str
+    fn: Callable[[], object]
+
+
+def load_fixtures(fixtures_dir: Path = FIXTURES_DIR) -> dict[str, dict]:
+    return {path.stem: json.loads(path.read_text(encoding="utf-8")) for path in sorted(fixtures_dir.glob("*.json"))}
+
+
+def inflate_intel(intel: dict, factor: int) -> dict:
+    inflated = {}
+    for key, value in intel.items():
+        if isinstance(value, list):
+            inflated[key] = [
+                {
+                    field: f"{item_value} {copy}" if copy and field in NAMED_FIELDS else item_value
+                    for field, item_value in item.items()
+                }
+                for copy in range(factor)
+                for item in value
+            ]
+        elif key == "tips":
+            inflated[key] = " ".join([value] * factor)
+        else:
+            inflated[key] = value
+    return inflated
+
+
+def bench_city(slug: str, intel: dict) -> City:
+    return City(
+        slug=slug,
+        city_name=slug.replace("-", " ").title(),
+        country="Benchland",
+        country_code="BL",
+        latitude=0.0,
+        longitude=0.0,
+        status="ready",
+        retrieved_at=datetime(2026, 1, 1, tzinfo=UTC),
+        intel=intel,
+        **intel_summary_columns(CityIntel.model_validate(intel)),
+    )
+
+
+def card_rows(count: int, intel_templates: list[dict]) -> list[CardRow]:
+    return [CardRow(**{key: city[key] for key in CardRow._fields}) for city in synthetic_cities(count, intel_templates)]
+
+
+def build_benchmarks(scales: tuple[int, ...], card_counts: tuple[int, ...]) -> list[Benchmark]:
+    fixtures = load_fixtures()
+    payloads = dict(fixtures)
+    largest = max(fixtures, key=lambda name: len(json.dumps(fixtures[name])))
+    for scale in scales:
+        payloads[f"{largest}x{scale}"] = inflate_intel(fixtures[largest], scale)
+
+    city_template = templates.get_template("city.html")
+    index_template = templates.get_template("index.html")
+    benchmarks = []
+    for payload, intel in payloads.items():
+        city = bench_city(bench_slug(0), intel)
+        request = build_export_request("https://groundwork.test", f"/{city.slug}")
+        context = city_page_context(request, city)
+        benchmarks += [
+            Benchmark("CityIntel.model_validate", payload, lambda intel=intel: CityIntel.model_validate(intel)),
+            Benchmark("to_city_response", payload, lambda city=city: to_city_response(city)),
+            Benchmark("city_page_context", payload, lambda city=city, request=request: city_page_context(request, city)),
+            Benchmark("render city.html", payload, lambda context=context: city_template.render(context)),
+        ]
+
+    intel_templates = list(fixtures.values())
+    request = build_export_request("https://groundwork.test", "/")
+    for count in card_counts:
+        rows = card_rows(count, intel_templates)
+        context = index_page_context(request, [build_city_card(row) for row in rows])
+        payload = f"{count} cards"
+        benchmarks += [
+            Benchmark("build_city_card", payload, lambda rows=rows: [build_city_card(row) for row in rows]),
+            Benchmark("render index.html", payload, lambda context=context: index_template.render(context)),
+        ]
+    return benchmarks
+
+
+def calibrate(fn: Callable[[], object], min_time: float) -> int:
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - started >= min_time:
+            return loops
+        loops *= 2
+
+
+def measure_allocations(fn: Callable[[], object]) -> dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    # Positive size/count deltas approximate what one call allocates and keeps alive until it returns.
+    stats = after.compare_to(before, "filename")
+    return {
+        "peak_kib": round((peak - baseline) / 1024, 1),
+        "allocated_kib": round(sum(max(stat.size_diff, 0) for stat in stats) / 1024, 1),
+        "allocated_blocks": sum(max(stat.count_diff, 0) for stat in stats),
+    }
+
+
+def run_benchmark(benchmark: Benchmark, min_time: float, repeat: int) -> dict:
+    benchmark.fn()
+    loops = calibrate(benchmark.fn, min_time)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            benchmark.fn()
+        timings.append((time.perf_counter() - started) / loops)
+    best = min(timings)
+    return {
+        "benchmark": benchmark.name,
+        "payload": benchmark.payload,
+        "loops": loops,
+        "ops_per_sec": round(1 / best, 1),
+        "best_us": round(best * 1_000_000, 1),
+        "median_us": round(sorted(timings)[len(timings) // 2] * 1_000_000, 1),
+        **measure_allocations(benchmark.fn),
+    }
+
+
+def result_key(result: dict) -> tuple[str, str]:
+    return result["benchmark"], result["payload"]
+
+
+def compare_to_baseline(results: list[dict], baseline: list[dict], tolerance: float = DEFAULT_TOLERANCE) -> list[dict]:
+    previous = {result_key(result): result for result in baseline}
+    comparisons = []
+    for result in results:
+        before = previous.get(result_key(result))
+        if before is None:
+            continue
+        ops_change = relative_change(before["ops_per_sec"], result["ops_per_sec"])
+        allocation_change = relative_change(before["peak_kib"], result["peak_kib"])
+        comparisons.append(
+            {
+                "benchmark": result["benchmark"],
+                "payload": result["payload"],
+                "ops_change": ops_change,
+                "peak_kib_change": allocation_change,
+                "regressed": (ops_change is not None and ops_change < -tolerance)
+                or (allocation_change is not None and allocation_change > tolerance),
+            }
+        )
+    return comparisons
+
+
+def parse_int_list(value: str) -> tuple[int, ...]:
+    numbers = tuple(int(part) for part in value.split(",") if part.strip())
+    if any(number < 1 for number in numbers):
+        raise argparse.ArgumentTypeError("values must be positive integers")
+    return numbers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time intel validation, card building and template rendering.")
+    parser.add_argument("--scales", type=parse_int_list, default=DEFAULT_SCALES, help="Intel inflation factors.")
+    parser.add_argument("--cards", type=parse_int_list, default=DEFAULT_CARD_COUNTS, help="Index card counts.")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text.")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME_SECONDS, help="Seconds per timing run.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timing runs; the best is reported.")
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results/micro.json"))
+    parser.add_argument("--baseline", type=Path, help="Earlier results file to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Relative ops/sec drop or peak allocation increase counted as a regression.",
+    )
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit non-zero if any benchmark regressed.")
+    args = parser.parse_args()
+
+    results = []
+    for benchmark in build_benchmarks(args.scales, args.cards):
+        if args.filter not in benchmark.name:
+            continue
+        result = run_benchmark(benchmark, args.min_time, args.repeat)
+        print(
+            f"{result['benchmark']:<26} {result['payload']:<22} {result['ops_per_sec']:>12,.1f} ops/s "
+            f"{result['best_us']:>12,.1f}us  peak={result['peak_kib']}KiB blocks={result['allocated_blocks']}",
+            flush=True,
+        )
+        results.append(result)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "git_commit": git_commit(),
+            "min_time_seconds": args.min_time,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        comparisons = compare_to_baseline(results, baseline["results"], args.tolerance)
+        report["baseline"] = {"path": str(args.baseline), "meta": baseline.get("meta"), "comparisons": comparisons}
+        regressions = [comparison for comparison in comparisons if comparison["regressed"]]
+        for comparison in regressions:
+            print(
+                f"REGRESSION {comparison['benchmark']} [{comparison['payload']}]: "
+                f"ops/sec {format_change(comparison['ops_change'])}, "
+                f"peak allocation {format_change(comparison['peak_kib_change'])}"
+            )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {args.output}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - tooling dependency
+    raise SystemExit("Pillow is required to generate image variants: pip install pillow")
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+STATIC_DIR = ROOT_DIR / "app" / "static"
+DEFAULT_WIDTHS = (32, 64, 96, 144, 192)
+
+
+def generate_variants(source: Path, output_dir: Path, widths: tuple[int, ...]) -> list[Path]:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written: list[Path] = []
+
+    with Image.open(source) as original:
+        image = original.convert("RGBA")
+        aspect_ratio = image.height / image.width
+
+        for width in widths:
+            height = max(1, round(width * aspect_ratio))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+
+            png_path = output_dir / f"{source.stem}-{width}w.png"
+            resized.save(png_path, format="PNG", optimize=True)
+            written.append(png_path)
+
+            webp_path = output_dir / f"{source.stem}-{width}w.webp"
+            resized.save(webp_path, format="WEBP", quality=85, method=6)
+            written.append(webp_path)
+
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate responsive PNG/WebP renditions of a static image.")
+    parser.add_argument("source", nargs="?", default=str(STATIC_DIR / "groundwork_logo.png"))
+    parser.add_argument("--output-dir", default=str(STATIC_DIR / "img"))
+    parser.add_argument("--widths", default=",".join(str(width) for width in DEFAULT_WIDTHS))
+    args = parser.parse_args()
+
+    source = Path(args.source)
+    if not source.is_file():
+        print(f"Source image not found: {source}", file=sys.stderr)
+        sys.exit(1)
+
+    widths = tuple(sorted({int(width) for width in args.widths.split(",") if width.strip()}))
+    for path in generate_variants(source, Path(args.output_dir), widths):
+        print(f"Wrote {path.relative_to(ROOT_DIR) if path.is_relative_to(ROOT_DIR) else path} ({path.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
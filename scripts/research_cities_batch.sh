@@ -7,10 +7,11 @@ Usage:
   ./scripts/research_cities_batch.sh \
     [--api-url "http://127.0.0.1:8000"] \
     [--api-key "<admin-api-key>"] \
-    [--delay-seconds 0]
+    [--delay-seconds 0] \
+    [--concurrency 1]
 
 Notes:
-- Runs a predefined list of 30 cities sequentially.
+- Runs a predefined list of 30 cities, --concurrency at a time (sequentially by default).
 - Calls ./scripts/research_city.sh for each city.
 - Defaults to local API URL: http://127.0.0.1:8000
 - If --api-key is omitted, ADMIN_API_KEY is read from environment/.env
@@ -31,6 +32,7 @@ fi
 API_URL="${GROUNDWORK_API_URL:-http://127.0.0.1:8000}"
 API_KEY="${ADMIN_API_KEY:-}"
 DELAY_SECONDS="0"
+CONCURRENCY="1"
 
 while [[ $# -gt 0 ]]; do
   case "$1" in
@@ -46,6 +48,10 @@ while [[ $# -gt 0 ]]; do
       DELAY_SECONDS="${2:-}"
       shift 2
       ;;
+    --concurrency)
+      CONCURRENCY="${2:-}"
+      shift 2
+      ;;
     -h|--help)
       usage
       exit 0
@@ -73,6 +79,11 @@ if ! [[ "$DELAY_SECONDS" =~ ^[0-9]+$ ]]; then
   exit 1
 fi
 
+if ! [[ "$CONCURRENCY" =~ ^[1-9][0-9]*$ ]]; then
+  echo "--concurrency must be a positive integer." >&2
+  exit 1
+fi
+
 health_status="$({
   curl -sS -o /dev/null -w "%{http_code}" "$API_URL/health"
 } || true)"
@@ -120,27 +131,50 @@ total="${#CITIES[@]}"
 success_count=0
 failure_count=0
 failed_list=()
+RESULTS_DIR="$(mktemp -d)"
+trap 'rm -rf "$RESULTS_DIR"' EXIT
 
-for i in "${!CITIES[@]}"; do
-  idx="$((i + 1))"
-  IFS="|" read -r city_name country <<<"${CITIES[$i]}"
-  echo "[$idx/$total] Researching ${city_name}, ${country}..."
-
+research_one() {
+  local idx="$1" city_name="$2" country="$3"
   if "$CITY_SCRIPT" \
     --city-name "$city_name" \
     --country "$country" \
     --api-url "$API_URL" \
     --api-key "$API_KEY"; then
-    success_count="$((success_count + 1))"
+    echo "ok" >"$RESULTS_DIR/$idx"
+    echo "[$idx/$total] Done: ${city_name}, ${country}"
   else
-    failure_count="$((failure_count + 1))"
-    failed_list+=("${city_name}, ${country}")
+    echo "${city_name}, ${country}" >"$RESULTS_DIR/$idx"
+    echo "[$idx/$total] Failed: ${city_name}, ${country}"
   fi
+}
+
+for i in "${!CITIES[@]}"; do
+  idx="$((i + 1))"
+  IFS="|" read -r city_name country <<<"${CITIES[$i]}"
+
+  while [[ "$(jobs -rp | wc -l)" -ge "$CONCURRENCY" ]]; do
+    wait -n || true
+  done
+
+  echo "[$idx/$total] Researching ${city_name}, ${country}..."
+  research_one "$idx" "$city_name" "$country" &
 
   if [[ "$idx" -lt "$total" && "$DELAY_SECONDS" -gt 0 ]]; then
     sleep "$DELAY_SECONDS"
   fi
 done
+wait
+
+for idx in $(seq 1 "$total"); do
+  result="$(cat "$RESULTS_DIR/$idx" 2>/dev/null || echo "${CITIES[$((idx - 1))]/|/, }")"
+  if [[ "$result" == "ok" ]]; then
+    success_count="$((success_count + 1))"
+  else
+    failure_count="$((failure_count + 1))"
+    failed_list+=("$result")
+  fi
+done
 
 echo
 echo "Batch research complete."
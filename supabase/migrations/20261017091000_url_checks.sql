@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS url_checks (
+    url TEXT PRIMARY KEY,
+    ok BOOLEAN NOT NULL,
+    reason TEXT,
+    status_code INTEGER,
+    checked_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_url_checks_checked_at ON url_checks(checked_at);
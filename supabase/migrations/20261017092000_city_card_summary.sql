@@ -0,0 +1,23 @@
+ALTER TABLE cities ADD COLUMN IF NOT EXISTS has_metro BOOLEAN NOT NULL DEFAULT FALSE;
+ALTER TABLE cities ADD COLUMN IF NOT EXISTS contactless BOOLEAN NOT NULL DEFAULT FALSE;
+ALTER TABLE cities ADD COLUMN IF NOT EXISTS rideshare_providers TEXT[] NOT NULL DEFAULT '{}';
+
+UPDATE cities
+SET
+    has_metro = EXISTS (
+        SELECT 1
+        FROM jsonb_array_elements(COALESCE(intel->'modes', '[]'::jsonb)) AS mode
+        WHERE mode->>'type' = 'metro'
+    ),
+    contactless = EXISTS (
+        SELECT 1
+        FROM jsonb_array_elements(COALESCE(intel->'payment_methods', '[]'::jsonb)) AS payment
+        WHERE lower(COALESCE(payment->>'method', '') || ' ' || COALESCE(payment->>'details', '')) LIKE '%contactless%'
+    ),
+    rideshare_providers = ARRAY(
+        SELECT option->>'provider'
+        FROM jsonb_array_elements(COALESCE(intel->'rideshare', '[]'::jsonb)) WITH ORDINALITY AS rideshare(option, position)
+        WHERE COALESCE((option->>'available')::boolean, FALSE)
+        ORDER BY position
+    )
+WHERE intel IS NOT NULL;
@@ -0,0 +1,7 @@
+-- slug is already covered by the UNIQUE constraint's index.
+DROP INDEX IF EXISTS idx_cities_slug;
+
+CREATE INDEX IF NOT EXISTS idx_cities_ready_listing
+    ON cities (retrieved_at DESC, city_name)
+    INCLUDE (slug, country, country_code, status, has_metro, contactless, rideshare_providers)
+    WHERE status = 'ready';
@@ -0,0 +1,19 @@
+CREATE TABLE IF NOT EXISTS generation_attempts (
+    id SERIAL PRIMARY KEY,
+    city_id INTEGER NOT NULL REFERENCES cities(id) ON DELETE CASCADE,
+    attempt INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    prompt_key TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    error TEXT,
+    duration_ms DOUBLE PRECISION,
+    response_encoding TEXT NOT NULL DEFAULT 'zlib',
+    response_bytes INTEGER,
+    response BYTEA,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_generation_attempts_city_created ON generation_attempts(city_id, created_at DESC);
+
+-- raw_response only ever held a copy of intel; the upstream payloads now live in generation_attempts.
+ALTER TABLE cities DROP COLUMN IF EXISTS raw_response;
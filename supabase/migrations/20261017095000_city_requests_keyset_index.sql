@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS idx_city_requests_requested_at_id ON city_requests(requested_at DESC, id DESC);
@@ -0,0 +1,36 @@
+ALTER TABLE cities ADD COLUMN IF NOT EXISTS search_document TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple'::regconfig, coalesce(city_name, '') || ' ' || coalesce(country, '')), 'A')
+    || setweight(
+        jsonb_to_tsvector(
+            'simple'::regconfig,
+            coalesce(intel->'authorities', '[]'::jsonb)
+                || coalesce(intel->'modes', '[]'::jsonb)
+                || coalesce(intel->'payment_methods', '[]'::jsonb),
+            '["string"]'
+        ),
+        'B'
+    )
+    || setweight(
+        jsonb_to_tsvector(
+            'simple'::regconfig,
+            coalesce(intel->'airport_connections', '[]'::jsonb) || coalesce(intel->'rideshare', '[]'::jsonb),
+            '["string"]'
+        ),
+        'C'
+    )
+    || setweight(to_tsvector('simple'::regconfig, coalesce(intel->>'tips', '')), 'D')
+) STORED;
+
+-- The catalog is written rarely; skipping the GIN pending list keeps every search on the index proper.
+CREATE INDEX IF NOT EXISTS idx_cities_search_document ON cities USING GIN (search_document) WITH (fastupdate = off)
+    WHERE status = 'ready';
+
+-- Typo tolerance on city names needs pg_trgm; search degrades to full-text only where it is unavailable.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        EXECUTE 'CREATE INDEX IF NOT EXISTS idx_cities_city_name_trgm ON cities USING GIN (lower(city_name) gin_trgm_ops) WHERE status = ''ready''';
+    END IF;
+END
+$$;
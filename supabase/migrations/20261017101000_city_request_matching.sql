@@ -0,0 +1,6 @@
+ALTER TABLE city_requests ADD COLUMN IF NOT EXISTS normalized_input TEXT;
+ALTER TABLE city_requests ADD COLUMN IF NOT EXISTS matched_city_id INTEGER REFERENCES cities(id) ON DELETE SET NULL;
+ALTER TABLE city_requests ADD COLUMN IF NOT EXISTS match_score DOUBLE PRECISION;
+
+CREATE INDEX IF NOT EXISTS idx_city_requests_matched_city_id ON city_requests(matched_city_id);
+CREATE INDEX IF NOT EXISTS idx_city_requests_normalized_input ON city_requests(normalized_input);
@@ -0,0 +1,4 @@
+ALTER TABLE generation_attempts ADD COLUMN IF NOT EXISTS trigger TEXT NOT NULL DEFAULT 'manual';
+
+CREATE INDEX IF NOT EXISTS idx_cities_ready_stale_after ON cities(stale_after) WHERE status = 'ready';
+CREATE INDEX IF NOT EXISTS idx_generation_attempts_trigger_created_at ON generation_attempts(trigger, created_at);
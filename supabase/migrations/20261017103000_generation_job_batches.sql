@@ -0,0 +1,3 @@
+ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS batch_id TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_batch_id ON generation_jobs(batch_id) WHERE batch_id IS NOT NULL;
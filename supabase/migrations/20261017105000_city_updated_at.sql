@@ -0,0 +1,19 @@
+ALTER TABLE cities ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS idx_cities_updated_at ON cities(updated_at);
+
+-- Every row change moves updated_at (status flips included), unless the statement sets it explicitly.
+CREATE OR REPLACE FUNCTION touch_cities_updated_at() RETURNS trigger AS $$
+BEGIN
+    IF NEW.updated_at IS NOT DISTINCT FROM OLD.updated_at THEN
+        NEW.updated_at := clock_timestamp();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS cities_touch_updated_at ON cities;
+CREATE TRIGGER cities_touch_updated_at
+    BEFORE UPDATE ON cities
+    FOR EACH ROW
+    EXECUTE FUNCTION touch_cities_updated_at();
@@ -0,0 +1,3 @@
+ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_active ON generation_jobs(status) WHERE status IN ('queued', 'running');
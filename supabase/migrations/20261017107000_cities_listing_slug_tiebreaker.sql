@@ -0,0 +1,7 @@
+-- (retrieved_at, city_name) is not unique, so keyset pages could skip or repeat tied rows; slug makes the order total.
+DROP INDEX IF EXISTS idx_cities_ready_listing;
+
+CREATE INDEX IF NOT EXISTS idx_cities_ready_listing
+    ON cities (retrieved_at DESC, city_name, slug)
+    INCLUDE (country, country_code, status, has_metro, contactless, rideshare_providers)
+    WHERE status = 'ready';
@@ -1,10 +1,15 @@
+import html
+import json
+import re
 from datetime import UTC, datetime, timedelta
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, select
 
+from app.assets import asset_url
 from app.config import get_settings
-from app.models import City, CityRequest
+from app.models import City, CityRequest, GenerationAttempt, GenerationJob
+from app.tracing import JsonlSpanExporter, set_span_exporter
 
 pytestmark = pytest.mark.integration
 
@@ -29,6 +34,24 @@ def _city_payload_for(city_name: str, country: str, country_code: str, latitude:
     }
 
 
+def test_metrics_exposes_route_latency_and_pool_gauges(client, sample_city):
+    assert client.get(f"/cities/{sample_city.slug}").status_code == 200
+    assert client.get("/definitely-not-a-city").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    body = response.text
+    assert "# TYPE groundwork_http_request_duration_seconds histogram" in body
+    assert 'groundwork_http_request_duration_seconds_count{method="GET",route="/cities/{slug}",status="200"}' in body
+    assert 'route="/{slug}",status="404"' in body
+    assert "barcelona-es" not in body
+    assert "groundwork_http_requests_in_flight 1" in body
+    assert 'groundwork_db_pool_checked_out{engine="sync"}' in body
+    assert "# TYPE groundwork_perplexity_request_duration_seconds histogram" in body
+
+
 def test_health(client):
     response = client.get("/health")
     assert response.status_code == 200
@@ -44,6 +67,37 @@ def test_unknown_html_page_renders_error_template(client):
     assert "const message =" in response.text
 
 
+def test_fingerprinted_static_assets_are_immutable_and_precompressed(client):
+    css_url = asset_url("style.css")
+    assert css_url != "/static/style.css"
+
+    brotli_response = client.get(css_url, headers={"Accept-Encoding": "gzip, br"})
+    assert brotli_response.status_code == 200
+    assert brotli_response.headers["content-encoding"] == "br"
+    assert brotli_response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert brotli_response.headers["vary"] == "Accept-Encoding"
+    assert ".site-header" in brotli_response.text
+
+    gzip_response = client.get(css_url, headers={"Accept-Encoding": "gzip"})
+    assert gzip_response.headers["content-encoding"] == "gzip"
+
+    identity_response = client.get(css_url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity_response.headers
+    assert identity_response.text == brotli_response.text
+
+    assert client.get(css_url, headers={"If-None-Match": brotli_response.headers["etag"]}).status_code == 304
+    assert client.get("/static/style.css").status_code == 200
+
+
+def test_pages_use_small_logo_renditions(client):
+    response = client.get("/")
+    assert response.status_code == 200
+    assert 'type="image/webp"' in response.text
+    assert 'src="/static/img/groundwork_logo-' in response.text
+    assert f'src="{asset_url("groundwork_logo.png")}"' not in response.text
+    assert '/static/groundwork_logo.png">' in response.text
+
+
 def test_get_cities_empty(client):
     response = client.get("/cities")
     assert response.status_code == 200
@@ -68,7 +122,6 @@ def test_get_cities_sorted_by_last_updated(client, db_session, sample_city):
         longitude=15.6459,
         status="ready",
         intel=sample_city.intel,
-        raw_response=sample_city.raw_response,
         retrieved_at=datetime.now(UTC) + timedelta(minutes=1),
     )
     db_session.add(newer_city)
@@ -81,6 +134,75 @@ def test_get_cities_sorted_by_last_updated(client, db_session, sample_city):
     assert data[1]["slug"] == sample_city.slug
 
 
+def test_get_cities_keyset_pagination(client, db_session, sample_city):
+    tied_at = datetime.now(UTC) + timedelta(minutes=1)
+    for slug, city_name, country, country_code in (
+        ("maribor-si", "Maribor", "Slovenia", "SI"),
+        ("ljubljana-si", "Ljubljana", "Slovenia", "SI"),
+    ):
+        db_session.add(
+            City(
+                slug=slug,
+                city_name=city_name,
+                country=country,
+                country_code=country_code,
+                status="ready",
+                retrieved_at=tied_at,
+            )
+        )
+    db_session.commit()
+
+    first = client.get("/cities", params={"limit": 2})
+    assert first.status_code == 200
+    assert [city["slug"] for city in first.json()] == ["ljubljana-si", "maribor-si"]
+    cursor = first.headers["x-next-cursor"]
+    assert 'rel="next"' in first.headers["link"]
+
+    second = client.get("/cities", params={"limit": 2, "cursor": cursor})
+    assert [city["slug"] for city in second.json()] == [sample_city.slug]
+    assert "link" not in second.headers
+    assert second.headers["etag"] != first.headers["etag"]
+
+    assert client.get("/cities", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/cities", params={"limit": 0}).status_code == 422
+
+
+def test_get_cities_pagination_breaks_ties_on_slug(client, db_session, sample_city):
+    tied_at = datetime.now(UTC) + timedelta(minutes=1)
+    slugs = ["springfield-us", "springfield-us-il", "springfield-us-ma"]
+    for slug in reversed(slugs):
+        db_session.add(
+            City(
+                slug=slug,
+                city_name="Springfield",
+                country="United States",
+                country_code="US",
+                status="ready",
+                retrieved_at=tied_at,
+            )
+        )
+    db_session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 1, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/cities", params=params)
+        assert page.status_code == 200
+        seen += [city["slug"] for city in page.json()]
+        cursor = page.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    assert seen == [*slugs, sample_city.slug]
+
+
+def test_index_cards_use_summary_columns(client, sample_city):
+    response = client.get("/")
+    assert response.status_code == 200
+    assert "Uber, Bolt, Bike-sharing, Electric scooters" in response.text
+
+
 def test_get_city_by_slug(client, sample_city):
     response = client.get(f"/cities/{sample_city.slug}")
     assert response.status_code == 200
@@ -89,6 +211,177 @@ def test_get_city_by_slug(client, sample_city):
     assert data["city_name"] == "Barcelona"
 
 
+def test_get_city_json_conditional_requests(client, db_session, sample_city):
+    response = client.get(f"/cities/{sample_city.slug}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert "stale-while-revalidate" in response.headers["cache-control"]
+
+    not_modified = client.get(f"/cities/{sample_city.slug}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    since = client.get(
+        f"/cities/{sample_city.slug}",
+        headers={"If-Modified-Since": response.headers["last-modified"]},
+    )
+    assert since.status_code == 304
+
+    sample_city.retrieved_at = sample_city.retrieved_at + timedelta(minutes=1)
+    db_session.commit()
+
+    refreshed = client.get(f"/cities/{sample_city.slug}", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+
+def test_conditional_city_requests_only_load_intel_when_sending_a_body(client, db_session, sample_city):
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for path in (f"/cities/{sample_city.slug}", f"/{sample_city.slug}"):
+        etag = client.get(path).headers["etag"]
+        db_session.expire(sample_city)
+        event.listen(db_session.bind, "before_cursor_execute", record)
+        try:
+            assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+            assert statements and not any("cities.intel" in statement for statement in statements)
+
+            statements.clear()
+            assert client.get(path).status_code == 200
+            assert any("cities.intel" in statement for statement in statements)
+        finally:
+            event.remove(db_session.bind, "before_cursor_execute", record)
+            statements.clear()
+
+
+def test_status_changes_invalidate_last_modified(client, db_session, sample_city):
+    sample_city.updated_at = datetime.now(UTC) - timedelta(minutes=5)
+    db_session.commit()
+
+    city = client.get(f"/cities/{sample_city.slug}")
+    listing = client.get("/cities")
+    assert client.get("/cities", headers={"If-Modified-Since": listing.headers["last-modified"]}).status_code == 304
+
+    sample_city.status = "failed"
+    db_session.commit()
+
+    since = client.get(f"/cities/{sample_city.slug}", headers={"If-Modified-Since": city.headers["last-modified"]})
+    assert since.status_code == 200
+    assert since.json()["status"] == "failed"
+
+    relisted = client.get("/cities", headers={"If-Modified-Since": listing.headers["last-modified"]})
+    assert relisted.status_code == 200
+    assert relisted.json() == []
+
+
+def test_city_html_and_list_pages_conditional_requests(client, db_session, sample_city):
+    for path in (f"/{sample_city.slug}", "/", "/cities"):
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        not_modified = client.get(path, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+
+    list_etag = client.get("/cities").headers["etag"]
+    newer_city = City(
+        slug="maribor-si",
+        city_name="Maribor",
+        country="Slovenia",
+        country_code="SI",
+        status="ready",
+        intel=sample_city.intel,
+        retrieved_at=datetime.now(UTC) + timedelta(minutes=1),
+    )
+    db_session.add(newer_city)
+    db_session.commit()
+
+    assert client.get("/cities", headers={"If-None-Match": list_etag}).status_code == 200
+
+
+def test_html_and_json_responses_are_compressed_and_memoized(client, sample_city, caplog):
+    from app.main import compressed_body_cache
+
+    compressed_body_cache.clear()
+    headers = {"Accept-Encoding": "br"}
+
+    with caplog.at_level("INFO", logger="groundwork.app"):
+        first = client.get(f"/cities/{sample_city.slug}", headers=headers)
+        second = client.get(f"/cities/{sample_city.slug}", headers=headers)
+
+    assert first.status_code == 200
+    assert first.headers["content-encoding"] == "br"
+    assert "accept-encoding" in first.headers["vary"].lower()
+    assert first.headers["etag"].startswith("W/")
+    assert first.json()["slug"] == sample_city.slug
+    assert second.content == first.content
+
+    records = [record for record in caplog.records if getattr(record, "compression_encoding", None) == "br"]
+    assert [record.compression_cache_hit for record in records] == [False, True]
+    assert all(record.compression_ratio < 1 for record in records)
+
+    not_modified = client.get(
+        f"/cities/{sample_city.slug}",
+        headers={**headers, "If-None-Match": first.headers["etag"]},
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == first.headers["etag"]
+
+    page = client.get(f"/{sample_city.slug}", headers={"Accept-Encoding": "gzip"})
+    assert page.headers["content-encoding"] == "gzip"
+    assert "Barcelona" in page.text
+
+    identity = client.get(f"/cities/{sample_city.slug}", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert not identity.headers["etag"].startswith("W/")
+
+
+def test_get_nearby_cities(client, db_session, sample_city):
+    db_session.add(
+        City(
+            slug="london-gb",
+            city_name="London",
+            country="United Kingdom",
+            country_code="GB",
+            latitude=51.5074,
+            longitude=-0.1278,
+            status="ready",
+            retrieved_at=datetime.now(UTC) + timedelta(minutes=1),
+        )
+    )
+    db_session.commit()
+
+    response = client.get("/cities/near", params={"lat": 51.1537, "lon": -0.1821, "limit": 2})
+    assert response.status_code == 200
+    nearby = response.json()
+    assert [city["slug"] for city in nearby] == ["london-gb", sample_city.slug]
+    assert 35 < nearby[0]["distance_km"] < 45
+    assert nearby[0]["distance_km"] < nearby[1]["distance_km"]
+
+    db_session.add(
+        City(
+            slug="crawley-gb",
+            city_name="Crawley",
+            country="United Kingdom",
+            country_code="GB",
+            latitude=51.1092,
+            longitude=-0.1872,
+            status="ready",
+            retrieved_at=datetime.now(UTC) + timedelta(minutes=2),
+        )
+    )
+    db_session.commit()
+    assert client.get("/cities/near", params={"lat": 51.1537, "lon": -0.1821}).json()[0]["slug"] == "crawley-gb"
+
+    assert client.get("/cities/near", params={"lat": 91, "lon": 0}).status_code == 422
+    assert client.get("/cities/near", params={"lat": 0}).status_code == 422
+
+
 def test_get_city_not_found(client):
     response = client.get("/cities/does-not-exist")
     assert response.status_code == 404
@@ -118,7 +411,8 @@ def test_index_includes_custom_analytics_hooks(client, sample_city):
         monkeypatch.undo()
 
     assert response.status_code == 200
-    assert "/static/analytics.js" in response.text
+    assert asset_url("analytics.js") in response.text
+    assert asset_url("analytics.js").startswith("/static/analytics.")
     assert '"page_name": "home"' in response.text
     assert '"current_page_name": "home"' in response.text
     assert '"current_city_slug"' in response.text
@@ -170,7 +464,6 @@ def test_get_index_sorts_latest_first(client, db_session, sample_city):
         longitude=15.6459,
         status="ready",
         intel=sample_city.intel,
-        raw_response=sample_city.raw_response,
         retrieved_at=datetime.now(UTC) + timedelta(minutes=1),
     )
     db_session.add(newer_city)
@@ -250,7 +543,6 @@ def test_get_city_html_hides_apps_without_store_links(client, db_session):
             "delay_info": [{"source": "Status", "url": "https://example.com/status"}],
             "tips": "No app needed.",
         },
-        raw_response="{}",
     )
     db_session.add(city)
     db_session.commit()
@@ -273,6 +565,36 @@ def test_create_city_success(client, mock_perplexity_response):
     assert data["intel"]["authorities"]
 
 
+def test_create_city_persists_card_summary(client, db_session, mock_perplexity_response):
+    response = client.post("/cities", headers={"X-API-Key": "test-key"}, json=_city_payload())
+    assert response.status_code == 201
+
+    stored = db_session.scalar(select(City).where(City.slug == "barcelona-es"))
+    assert stored is not None
+    assert stored.has_metro is True
+    assert stored.contactless is True
+    assert stored.rideshare_providers == ["Uber", "Bolt", "Bike-sharing", "Electric scooters"]
+
+
+def test_create_city_archives_raw_response_compressed(client, db_session, mock_perplexity_response):
+    response = client.post("/cities", headers={"X-API-Key": "test-key"}, json=_city_payload())
+    assert response.status_code == 201
+
+    stored = db_session.scalar(select(GenerationAttempt).where(GenerationAttempt.outcome == "accepted"))
+    assert stored is not None
+    assert stored.response_encoding == "zlib"
+    assert len(stored.response) < stored.response_bytes
+
+    assert client.get("/cities/barcelona-es/attempts").status_code == 401
+    attempts = client.get("/cities/barcelona-es/attempts", headers={"X-API-Key": "test-key"})
+    assert attempts.status_code == 200
+    [attempt] = attempts.json()
+    assert attempt["attempt"] == 1
+    assert attempt["model"] == "sonar-pro"
+    assert attempt["response"]["choices"][0]["message"]["content"]
+    assert attempt["stored_bytes"] < attempt["response_bytes"]
+
+
 @pytest.mark.parametrize(
     ("payload", "expected_slug"),
     [
@@ -328,7 +650,6 @@ def test_create_city_conflict_when_generation_in_progress(client, db_session):
         longitude=2.1686,
         status="generating",
         intel=None,
-        raw_response=None,
     )
     db_session.add(city)
     db_session.commit()
@@ -338,6 +659,93 @@ def test_create_city_conflict_when_generation_in_progress(client, db_session):
     assert response.json()["detail"] == "City is currently generating"
 
 
+def test_stale_generations_are_recovered_and_can_be_regenerated(client, db_session, mock_perplexity_response):
+    from app.jobs import INTERRUPTED_JOB_ERROR, recover_stale_generations
+
+    long_ago = datetime.now(UTC) - timedelta(hours=3)
+    orphaned = City(
+        slug="barcelona-es",
+        city_name="Barcelona",
+        country="Spain",
+        country_code="ES",
+        status="generating",
+        updated_at=long_ago,
+    )
+    in_progress = City(slug="milan-it", city_name="Milan", country="Italy", country_code="IT", status="generating")
+    db_session.add_all([orphaned, in_progress])
+    db_session.flush()
+    stranded_job = GenerationJob(
+        city_id=orphaned.id, slug=orphaned.slug, status="running", created_at=long_ago, started_at=long_ago
+    )
+    fresh_job = GenerationJob(city_id=in_progress.id, slug=in_progress.slug, status="queued")
+    db_session.add_all([stranded_job, fresh_job])
+    db_session.commit()
+
+    assert recover_stale_generations(db_session) == (1, 1)
+    db_session.refresh(stranded_job)
+    db_session.refresh(fresh_job)
+    db_session.refresh(orphaned)
+    db_session.refresh(in_progress)
+    assert stranded_job.status == "failed"
+    assert stranded_job.error == INTERRUPTED_JOB_ERROR
+    assert orphaned.status == "failed"
+    assert fresh_job.status == "queued"
+    assert in_progress.status == "generating"
+
+    from app.main import process_generation_job
+
+    assert process_generation_job(db_session, stranded_job.id).status == "failed"
+
+    orphaned.status = "generating"
+    orphaned.updated_at = long_ago
+    db_session.commit()
+
+    response = client.post("/cities", headers={"X-API-Key": "test-key"}, json=_city_payload())
+    assert response.status_code == 201
+    assert response.json()["status"] == "ready"
+
+
+def test_recovery_leaves_queued_jobs_of_an_active_batch_alone(db_session):
+    from app.jobs import beat_owned_jobs, recover_stale_generations, track_jobs, untrack_job
+
+    long_ago = datetime.now(UTC) - timedelta(hours=3)
+    cities = [
+        City(
+            slug=f"{name.lower()}-it",
+            city_name=name,
+            country="Italy",
+            country_code="IT",
+            status="generating",
+            updated_at=long_ago,
+        )
+        for name in ("Milan", "Turin", "Genoa")
+    ]
+    db_session.add_all(cities)
+    db_session.flush()
+    # One job is owned by another worker that still heartbeats, one by this process, one by a dead worker.
+    other_worker, this_worker, dead_worker = [
+        GenerationJob(city_id=city.id, slug=city.slug, batch_id="batch-1", status="queued", created_at=long_ago)
+        for city in cities
+    ]
+    other_worker.heartbeat_at = datetime.now(UTC) - timedelta(seconds=30)
+    dead_worker.heartbeat_at = long_ago
+    db_session.add_all([other_worker, this_worker, dead_worker])
+    db_session.commit()
+
+    track_jobs([this_worker.id])
+    try:
+        assert beat_owned_jobs(db_session) == 1
+        assert recover_stale_generations(db_session) == (1, 1)
+    finally:
+        untrack_job(this_worker.id)
+
+    for row in (*cities, other_worker, this_worker, dead_worker):
+        db_session.refresh(row)
+    assert this_worker.heartbeat_at > long_ago
+    assert [other_worker.status, this_worker.status, dead_worker.status] == ["queued", "queued", "failed"]
+    assert [city.status for city in cities] == ["generating", "generating", "failed"]
+
+
 def test_create_city_retries_failed_slug(client, db_session, mock_perplexity_response):
     failed_city = City(
         slug="barcelona-es",
@@ -348,7 +756,6 @@ def test_create_city_retries_failed_slug(client, db_session, mock_perplexity_res
         longitude=2.1686,
         status="failed",
         intel=None,
-        raw_response=None,
     )
     db_session.add(failed_city)
     db_session.commit()
@@ -387,6 +794,136 @@ def test_create_city_perplexity_400_details(client, httpx_mock):
     assert "Malformed request payload" in detail
 
 
+def test_create_city_background_returns_job(client, db_session, run_queued_jobs, mock_perplexity_response):
+    response = client.post("/cities?background=true", headers={"X-API-Key": "test-key"}, json=_city_payload())
+    assert response.status_code == 202
+
+    data = response.json()
+    assert data["slug"] == "barcelona-es"
+    assert data["status"] == "queued"
+    assert data["city_status"] == "generating"
+    assert response.headers["location"] == f"/jobs/{data['id']}"
+
+    run_queued_jobs()
+
+    job_response = client.get(f"/jobs/{data['id']}", headers={"X-API-Key": "test-key"})
+    assert job_response.status_code == 200
+    job = job_response.json()
+    assert job["status"] == "succeeded"
+    assert job["city_status"] == "ready"
+    assert job["error"] is None
+    assert job["finished_at"] is not None
+
+    stored = db_session.scalar(select(City).where(City.slug == "barcelona-es"))
+    assert stored is not None
+    assert stored.status == "ready"
+    assert stored.intel is not None
+
+
+def test_create_city_batch_reports_per_city_progress(
+    client, db_session, run_queued_jobs, mock_perplexity_response_by_city
+):
+    db_session.add(
+        City(slug="riga-lv", city_name="Riga", country="Latvia", country_code="LV", status="generating")
+    )
+    db_session.commit()
+
+    payload = {
+        "cities": [
+            _city_payload(),
+            _city_payload_for("Milan", "Italy", "IT", 45.4642, 9.19),
+            _city_payload_for("Riga", "Latvia", "LV", 56.9496, 24.1052),
+        ],
+        "concurrency": 50,
+    }
+    assert client.post("/cities/batch", json=payload).status_code == 401
+
+    response = client.post("/cities/batch", headers={"X-API-Key": "test-key"}, json=payload)
+    assert response.status_code == 202
+    batch = response.json()
+    assert response.headers["location"] == f"/batches/{batch['batch_id']}"
+    assert batch["concurrency"] == 8
+    assert batch["total"] == 2
+    assert batch["queued"] == 2
+    assert [job["slug"] for job in batch["jobs"]] == ["barcelona-es", "milan-it"]
+    assert all(job["city_status"] == "generating" for job in batch["jobs"])
+    assert batch["rejected"] == [{"slug": "riga-lv", "detail": "City is currently generating"}]
+
+    run_queued_jobs()
+
+    progress = client.get(f"/batches/{batch['batch_id']}", headers={"X-API-Key": "test-key"})
+    assert progress.status_code == 200
+    data = progress.json()
+    assert data["succeeded"] == 2
+    assert data["queued"] == data["running"] == data["failed"] == 0
+    assert {job["city_status"] for job in data["jobs"]} == {"ready"}
+    assert all(job["batch_id"] == batch["batch_id"] for job in data["jobs"])
+
+    assert client.get("/batches/unknown", headers={"X-API-Key": "test-key"}).status_code == 404
+
+
+def test_create_city_batch_enforces_size_limit(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "GENERATION_BATCH_MAX_CITIES", 1)
+
+    response = client.post(
+        "/cities/batch",
+        headers={"X-API-Key": "test-key"},
+        json={"cities": [_city_payload(), _city_payload_for("Milan", "Italy", "IT", 45.4642, 9.19)]},
+    )
+    assert response.status_code == 422
+    assert client.post("/cities/batch", headers={"X-API-Key": "test-key"}, json={"cities": []}).status_code == 422
+
+
+def test_create_city_emits_spans_for_generation_pipeline(client, mock_perplexity_response, tmp_path):
+    trace_path = tmp_path / "spans.jsonl"
+    set_span_exporter(JsonlSpanExporter(trace_path))
+    try:
+        response = client.post("/cities", headers={"X-API-Key": "test-key"}, json=_city_payload())
+    finally:
+        set_span_exporter(None)
+    assert response.status_code == 201
+
+    spans = [json.loads(line) for line in trace_path.read_text(encoding="utf-8").splitlines()]
+    by_name = {span["name"]: span for span in spans}
+    assert {"create_city_profile", "db.prepare_city", "generate_intel", "perplexity.call", "perplexity.request"} <= set(
+        by_name
+    )
+    assert len({span["trace_id"] for span in spans}) == 1
+    assert by_name["create_city_profile"]["parent_id"] is None
+    assert by_name["generate_intel"]["parent_id"] == by_name["create_city_profile"]["span_id"]
+    assert by_name["perplexity.call"]["parent_id"] == by_name["generate_intel"]["span_id"]
+    assert by_name["perplexity.call"]["attributes"]["attempt"] == 1
+    assert by_name["perplexity.request"]["attributes"]["status_code"] == 200
+    assert by_name["db.commit"]["attributes"]["status"] == "ready"
+
+
+def test_create_city_background_records_failure(client, db_session, run_queued_jobs, httpx_mock):
+    httpx_mock.add_response(
+        method="POST",
+        url="https://api.perplexity.ai/chat/completions",
+        status_code=400,
+        json={"error": {"message": "Malformed request payload"}},
+    )
+
+    response = client.post("/cities?background=true", headers={"X-API-Key": "test-key"}, json=_city_payload())
+    assert response.status_code == 202
+    run_queued_jobs()
+
+    job = db_session.get(GenerationJob, response.json()["id"])
+    assert job is not None
+    assert job.status == "failed"
+    assert "Perplexity API error 400" in job.error
+
+    job_response = client.get(f"/jobs/{job.id}", headers={"X-API-Key": "test-key"})
+    assert job_response.json()["city_status"] == "failed"
+
+
+def test_get_job_requires_auth_and_existing_job(client):
+    assert client.get("/jobs/1").status_code == 401
+    assert client.get("/jobs/1", headers={"X-API-Key": "wrong-key"}).status_code == 403
+    assert client.get("/jobs/999999", headers={"X-API-Key": "test-key"}).status_code == 404
+
+
 def test_create_city_no_auth(client):
     response = client.post("/cities", json=_city_payload())
     assert response.status_code == 401
@@ -408,11 +945,60 @@ def test_request_city(client, db_session):
     assert stored.email == "user@example.com"
 
 
+def test_request_city_matches_existing_guide(client, db_session, sample_city):
+    response = client.post("/requests", json={"raw_input": "BCN"})
+    assert response.status_code == 201
+    data = response.json()
+    assert data["match"]["slug"] == sample_city.slug
+    assert data["match"]["url"] == f"/{sample_city.slug}"
+    assert "already have a guide" in data["message"]
+
+    stored = db_session.scalar(select(CityRequest).where(CityRequest.raw_input == "BCN"))
+    assert stored.status == "fulfilled"
+    assert stored.matched_city_id == sample_city.id
+    assert stored.normalized_input == "bcn"
+
+    suggestion = client.post("/requests", json={"raw_input": "Barcleona"}).json()
+    assert suggestion["match"]["slug"] == sample_city.slug
+    suggested = db_session.scalar(select(CityRequest).where(CityRequest.raw_input == "Barcleona"))
+    assert suggested.status == "pending"
+    assert 0 < suggested.match_score < 1
+
+    unmatched = client.post("/requests", json={"raw_input": "Joburg"}).json()
+    assert unmatched["match"] is None
+
+    page = client.get("/requests")
+    assert f'<a href="/{sample_city.slug}">Barcelona</a>' in page.text
+
+
 def test_request_city_empty_input(client):
     response = client.post("/requests", json={"raw_input": ""})
     assert response.status_code == 422
 
 
+def test_get_requests_page_keyset_pagination(client, db_session, monkeypatch):
+    import app.main as main_module
+
+    monkeypatch.setattr(main_module, "REQUESTS_PAGE_SIZE", 2)
+    requested_at = datetime.now(UTC)
+    for offset, raw_input in enumerate(["Oldest", "Tied A", "Tied B"]):
+        db_session.add(CityRequest(raw_input=raw_input, requested_at=requested_at + timedelta(minutes=min(offset, 1))))
+    db_session.commit()
+
+    first = client.get("/requests")
+    assert "Tied B" in first.text and "Tied A" in first.text
+    assert "Oldest" not in first.text
+    older = re.search(r'href="([^"]+)" rel="next"', first.text)
+    assert older is not None
+
+    second = client.get(html.unescape(older.group(1)))
+    assert second.status_code == 200
+    assert "Oldest" in second.text
+    assert "Tied" not in second.text
+    assert 'rel="next"' not in second.text
+    assert "Newest requests" in second.text
+
+
 def test_get_requests_page(client):
     create_response = client.post("/requests", json={"raw_input": "Portland Oregon", "email": "ops@example.com"})
     assert create_response.status_code == 201
@@ -0,0 +1,51 @@
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.main import app, intel_summary_columns
+from app.models import City, CityIntel, CityRequest
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture()
+def committed_city(engine):
+    intel = json.loads((Path(__file__).resolve().parent.parent / "fixtures" / "riga-latvia.json").read_text())
+    with Session(engine) as session:
+        city = City(
+            slug="async-riga-lv",
+            city_name="Riga",
+            country="Latvia",
+            country_code="LV",
+            status="ready",
+            intel=intel,
+            **intel_summary_columns(CityIntel.model_validate(intel)),
+        )
+        session.add(city)
+        session.add(CityRequest(raw_input="Async Riga", matched_city_id=None))
+        session.commit()
+        session.refresh(city)
+
+    yield city
+
+    with Session(engine) as session:
+        session.execute(delete(CityRequest).where(CityRequest.raw_input == "Async Riga"))
+        session.execute(delete(City).where(City.id == city.id))
+        session.commit()
+
+
+def test_read_routes_run_on_asyncpg(committed_city):
+    with TestClient(app) as client:
+        city = client.get(f"/cities/{committed_city.slug}")
+        assert city.status_code == 200
+        assert city.json()["intel"] is not None
+
+        assert client.get(f"/{committed_city.slug}").status_code == 200
+        assert committed_city.slug in client.get("/").text
+        assert committed_city.slug in [item["slug"] for item in client.get("/cities").json()]
+        assert "Async Riga" in client.get("/requests").text
+        assert client.get("/cities/missing-city").status_code == 404
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+import pytest
+
+from app.assets import get_asset_manifest
+from app.export import EXPORT_MANIFEST_NAME, export_site
+
+pytestmark = pytest.mark.integration
+
+
+def test_export_site_renders_ready_cities_and_rebuilds_incrementally(db_session, sample_city, tmp_path):
+    result = export_site(db_session, tmp_path, base_url="https://groundwork.example")
+
+    assert result["rendered"] == 1
+    page = (tmp_path / sample_city.slug / "index.html").read_text(encoding="utf-8")
+    assert "Barcelona" in page
+    assert f"https://groundwork.example/{sample_city.slug}" in page
+    assert sample_city.slug in (tmp_path / "index.html").read_text(encoding="utf-8")
+    assert (tmp_path / EXPORT_MANIFEST_NAME).is_file()
+
+    stylesheet = get_asset_manifest().by_name["style.css"]
+    assert (tmp_path / "static" / stylesheet.versioned_name).read_bytes() == stylesheet.path.read_bytes()
+    assert (tmp_path / "static" / f"{stylesheet.versioned_name}.br").is_file()
+
+    unchanged = export_site(db_session, tmp_path, base_url="https://groundwork.example")
+    assert unchanged["rendered"] == 0
+    assert unchanged["unchanged"] == 1
+    assert unchanged["assets_written"] == 0
+
+    sample_city.retrieved_at = sample_city.retrieved_at + timedelta(minutes=1)
+    db_session.commit()
+    assert export_site(db_session, tmp_path, base_url="https://groundwork.example")["rendered"] == 1
+
+    assert export_site(db_session, tmp_path, base_url="https://groundwork.test")["rendered"] == 1
+
+    sample_city.status = "failed"
+    db_session.commit()
+    removed = export_site(db_session, tmp_path, base_url="https://groundwork.test")
+    assert removed["removed"] == 1
+    assert not (tmp_path / sample_city.slug).exists()
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import or_, text, tuple_
+from sqlalchemy.dialects import postgresql
+
+from app.main import CITY_CARD_COLUMNS, CITY_LIST_COLUMNS, ready_cities_query
+from app.models import City
+from app.search import search_query
+
+pytestmark = pytest.mark.integration
+
+
+def _explain(db_session, statement) -> str:
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    return "\n".join(db_session.execute(text(f"EXPLAIN {sql}")).scalars())
+
+
+@pytest.mark.parametrize("columns", [CITY_CARD_COLUMNS, CITY_LIST_COLUMNS], ids=["cards", "list"])
+def test_ready_listing_queries_use_covering_index(db_session, sample_city, columns):
+    # The test table is tiny, so take sequential scans off the table to see which index the planner picks.
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+
+    plan = _explain(db_session, ready_cities_query(*columns))
+
+    assert "Index Only Scan using idx_cities_ready_listing" in plan
+    assert "Sort" not in plan
+
+
+def test_redundant_slug_index_is_dropped(db_session):
+    indexes = db_session.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = 'cities'")).scalars().all()
+
+    assert "idx_cities_slug" not in indexes
+    assert "idx_cities_ready_listing" in indexes
+
+
+def test_cities_keyset_page_seeks_the_listing_index(db_session, sample_city):
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    statement = (
+        ready_cities_query(*CITY_LIST_COLUMNS, City.retrieved_at)
+        .where(
+            City.retrieved_at <= sample_city.retrieved_at,
+            or_(
+                City.retrieved_at < sample_city.retrieved_at,
+                tuple_(City.city_name, City.slug) > (sample_city.city_name, sample_city.slug),
+            ),
+        )
+        .limit(101)
+    )
+
+    plan = _explain(db_session, statement)
+
+    assert "Index Only Scan using idx_cities_ready_listing" in plan
+    assert "Index Cond: (retrieved_at <=" in plan
+    assert "Sort" not in plan
+
+
+def test_search_uses_gin_index(db_session, sample_city):
+    db_session.execute(
+        text(
+            "INSERT INTO cities (slug, city_name, country, country_code, status, intel) "
+            "SELECT 'city-' || n, 'City ' || n, 'Country', 'CC', 'ready', '{\"tips\": \"Take the tram.\"}'::jsonb "
+            "FROM generate_series(1, 2000) AS n"
+        )
+    )
+    db_session.execute(text("ANALYZE cities"))
+
+    plan = _explain(db_session, search_query(db_session, "aerobus", 20))
+
+    assert "Bitmap Index Scan on idx_cities_search_document" in plan
@@ -0,0 +1,31 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.rate_limit import acquire_token, block_bucket
+
+pytestmark = pytest.mark.integration
+
+
+def test_acquire_token_spends_burst_then_refills(db_session):
+    now = datetime.now(UTC)
+
+    assert [acquire_token(db_session, "test", 1.0, 2, now=now) for _ in range(2)] == [0.0, 0.0]
+    assert acquire_token(db_session, "test", 1.0, 2, now=now) == pytest.approx(1.0)
+    assert acquire_token(db_session, "test", 1.0, 2, now=now + timedelta(seconds=0.5)) == pytest.approx(0.5)
+    assert acquire_token(db_session, "test", 1.0, 2, now=now + timedelta(seconds=1)) == 0.0
+    assert acquire_token(db_session, "other", 1.0, 2, now=now) == 0.0
+
+
+def test_block_bucket_pauses_every_consumer_until_deadline(db_session):
+    now = datetime.now(UTC)
+    acquire_token(db_session, "test", 10.0, 5, now=now)
+
+    block_bucket(db_session, "test", now + timedelta(seconds=30), now=now)
+    block_bucket(db_session, "test", now + timedelta(seconds=10), now=now)
+
+    assert acquire_token(db_session, "test", 10.0, 5, now=now) == pytest.approx(30.0)
+    assert acquire_token(db_session, "test", 10.0, 5, now=now + timedelta(seconds=31)) == 0.0
+
+    block_bucket(db_session, "fresh", now + timedelta(seconds=5), now=now)
+    assert acquire_token(db_session, "fresh", 10.0, 5, now=now) == pytest.approx(5.0)
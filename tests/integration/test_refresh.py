@@ -0,0 +1,75 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.main import refresh_city_profile
+from app.models import City, GenerationAttempt
+from app.refresh import REFRESH_TRIGGER, claim_stale_cities, refreshes_started_today
+
+pytestmark = pytest.mark.integration
+
+
+def test_claim_stale_cities_leases_oldest_ready_cities(db_session, sample_city):
+    now = datetime.now(UTC)
+    sample_city.stale_after = now - timedelta(days=1)
+    fresh = City(
+        slug="milan-it",
+        city_name="Milan",
+        country="Italy",
+        country_code="IT",
+        status="ready",
+        stale_after=now + timedelta(days=5),
+    )
+    pending = City(
+        slug="riga-lv",
+        city_name="Riga",
+        country="Latvia",
+        country_code="LV",
+        status="pending",
+        stale_after=now,
+    )
+    db_session.add_all([fresh, pending])
+    db_session.commit()
+
+    claimed = claim_stale_cities(db_session, limit=5, lease=timedelta(hours=6), now=now)
+
+    assert claimed == [sample_city.id]
+    db_session.refresh(sample_city)
+    assert sample_city.stale_after == now + timedelta(hours=6)
+    assert claim_stale_cities(db_session, limit=5, lease=timedelta(hours=6), now=now) == []
+    assert claim_stale_cities(db_session, limit=0, lease=timedelta(hours=6), now=now + timedelta(days=1)) == []
+
+
+def test_refresh_city_profile_replaces_intel_after_validation(db_session, sample_city, mock_perplexity_response):
+    previous_retrieved_at = sample_city.retrieved_at
+
+    assert refresh_city_profile(db_session, sample_city.id) is True
+
+    db_session.refresh(sample_city)
+    assert sample_city.status == "ready"
+    assert sample_city.retrieved_at > previous_retrieved_at
+    assert sample_city.stale_after >= sample_city.retrieved_at + timedelta(days=30)
+
+    [attempt] = db_session.query(GenerationAttempt).filter_by(city_id=sample_city.id).all()
+    assert attempt.trigger == REFRESH_TRIGGER
+    assert attempt.outcome == "accepted"
+    assert refreshes_started_today(db_session) == 1
+
+
+def test_refresh_city_profile_keeps_previous_intel_on_failure(db_session, sample_city, httpx_mock):
+    httpx_mock.add_response(
+        method="POST",
+        url="https://api.perplexity.ai/chat/completions",
+        status_code=400,
+        json={"error": {"message": "Malformed request payload"}},
+    )
+    previous_intel = sample_city.intel
+    previous_retrieved_at = sample_city.retrieved_at
+
+    assert refresh_city_profile(db_session, sample_city.id) is False
+
+    db_session.refresh(sample_city)
+    assert sample_city.status == "ready"
+    assert sample_city.intel == previous_intel
+    assert sample_city.retrieved_at == previous_retrieved_at
+    assert refreshes_started_today(db_session) == 1
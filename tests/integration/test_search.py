@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.main import intel_summary_columns
+from app.models import City, CityIntel
+from app.search import trigram_available
+
+pytestmark = pytest.mark.integration
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "fixtures"
+
+
+@pytest.fixture()
+def london_city(db_session):
+    intel = json.loads((FIXTURES_DIR / "london.json").read_text())
+    city = City(
+        slug="london-gb",
+        city_name="London",
+        country="United Kingdom",
+        country_code="GB",
+        status="ready",
+        intel=intel,
+        **intel_summary_columns(CityIntel.model_validate(intel)),
+    )
+    db_session.add(city)
+    db_session.commit()
+    return city
+
+
+def test_search_matches_text_inside_intel(client, sample_city, london_city):
+    oyster = client.get("/search", params={"q": "Oyster"})
+    assert oyster.status_code == 200
+    assert [result["slug"] for result in oyster.json()] == [london_city.slug]
+
+    aerobus = client.get("/search", params={"q": "aerob"})
+    assert [result["slug"] for result in aerobus.json()] == [sample_city.slug]
+
+
+def test_search_ranks_city_name_above_incidental_mentions(client, sample_city, london_city):
+    response = client.get("/search", params={"q": "london"})
+
+    results = response.json()
+    assert results[0]["slug"] == london_city.slug
+    assert results[0]["rank"] >= results[-1]["rank"]
+
+
+def test_search_skips_cities_that_are_not_ready(client, db_session, sample_city):
+    sample_city.status = "failed"
+    db_session.commit()
+
+    assert client.get("/search", params={"q": "Barcelona"}).json() == []
+
+
+def test_search_validates_query(client):
+    assert client.get("/search").status_code == 422
+    assert client.get("/search", params={"q": "!!!"}).json() == []
+
+
+def test_search_tolerates_typos_in_city_names(client, db_session, sample_city):
+    if not trigram_available(db_session):
+        pytest.skip("pg_trgm is not installed on this Postgres")
+
+    response = client.get("/search", params={"q": "Barcleona"})
+    assert [result["slug"] for result in response.json()] == [sample_city.slug]
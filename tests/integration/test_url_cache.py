@@ -0,0 +1,53 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.url_cache import load_url_checks, save_url_checks
+
+pytestmark = pytest.mark.integration
+
+
+def test_url_checks_round_trip_and_upsert(db_session):
+    checked_at = datetime.now(UTC)
+    save_url_checks(
+        db_session,
+        {
+            "https://tfl.gov.uk": (True, None, 200),
+            "https://tfl.gov.uk/missing": (False, "HTTP 404", 404),
+        },
+        checked_at=checked_at,
+    )
+    save_url_checks(db_session, {"https://tfl.gov.uk/missing": (True, None, 200)}, checked_at=checked_at)
+
+    cached = load_url_checks(
+        db_session,
+        ["https://tfl.gov.uk", "https://tfl.gov.uk/missing", "https://unseen.example"],
+        ok_ttl=timedelta(days=7),
+        fail_ttl=timedelta(hours=6),
+    )
+
+    assert cached == {
+        "https://tfl.gov.uk": (True, None, 200),
+        "https://tfl.gov.uk/missing": (True, None, 200),
+    }
+
+
+def test_url_checks_apply_separate_positive_and_negative_ttls(db_session):
+    checked_at = datetime.now(UTC) - timedelta(hours=12)
+    save_url_checks(
+        db_session,
+        {
+            "https://www.tmb.cat": (True, None, 200),
+            "https://www.tmb.cat/gone": (False, "HTTP 410", 410),
+        },
+        checked_at=checked_at,
+    )
+
+    cached = load_url_checks(
+        db_session,
+        ["https://www.tmb.cat", "https://www.tmb.cat/gone"],
+        ok_ttl=timedelta(days=7),
+        fail_ttl=timedelta(hours=6),
+    )
+
+    assert cached == {"https://www.tmb.cat": (True, None, 200)}
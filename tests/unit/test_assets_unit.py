@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+
+from app.assets import AssetManifest, preferred_encoding
+
+pytestmark = pytest.mark.unit
+
+
+def test_asset_manifest_fingerprints_and_precompresses_text_assets(tmp_path: Path):
+    (tmp_path / "style.css").write_text("body { color: #000; }\n" * 200, encoding="utf-8")
+    (tmp_path / "img").mkdir()
+    (tmp_path / "img" / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(range(256)))
+    (tmp_path / ".hidden").write_text("skip", encoding="utf-8")
+
+    manifest = AssetManifest(tmp_path)
+
+    css = manifest.by_name["style.css"]
+    assert css.versioned_name.startswith("style.")
+    assert css.versioned_name.endswith(".css")
+    assert manifest.url("style.css") == f"/static/{css.versioned_name}"
+    assert set(css.encoded) == {"br", "gzip"}
+
+    logo = manifest.by_name["img/logo.png"]
+    assert logo.versioned_name.startswith("img/logo.")
+    assert logo.encoded == {}
+    assert ".hidden" not in manifest.by_name
+    assert manifest.url("missing.js") == "/static/missing.js"
+
+    (tmp_path / "style.css").write_text("body { color: #fff; }\n", encoding="utf-8")
+    assert AssetManifest(tmp_path).by_name["style.css"].versioned_name != css.versioned_name
+
+
+def test_preferred_encoding_respects_quality_values():
+    available = {"br", "gzip"}
+
+    assert preferred_encoding("gzip, deflate, br", available) == "br"
+    assert preferred_encoding("gzip, br;q=0", available) == "gzip"
+    assert preferred_encoding("*", available) == "br"
+    assert preferred_encoding("identity", available) is None
+    assert preferred_encoding("", available) is None
+    assert preferred_encoding("br", {"gzip"}) is None
+
+
+def test_asset_manifest_builds_responsive_image_srcsets(tmp_path: Path):
+    (tmp_path / "img").mkdir()
+    for width in (64, 32, 128):
+        (tmp_path / "img" / f"logo-{width}w.png").write_bytes(f"png-{width}".encode())
+        (tmp_path / "img" / f"logo-{width}w.webp").write_bytes(f"webp-{width}".encode())
+    (tmp_path / "logo.png").write_bytes(b"full-resolution")
+
+    manifest = AssetManifest(tmp_path)
+
+    srcset = manifest.image_srcset("logo", "webp")
+    assert [entry.split(" ")[1] for entry in srcset.split(", ")] == ["32w", "64w", "128w"]
+    assert manifest.image_url("logo", 60, "png") == manifest.url("img/logo-64w.png")
+    assert manifest.image_url("logo", 500, "png") == manifest.url("img/logo-128w.png")
+    assert manifest.image_url("icon", 64, "png") == "/static/icon.png"
+    assert manifest.image_srcset("icon", "png") == ""
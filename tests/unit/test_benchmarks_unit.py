@@ -0,0 +1,78 @@
+from collections import Counter
+
+import pytest
+
+from app.models import CityIntel
+from benchmarks.catalog import bench_slug, load_fixture_intel, synthetic_cities
+from benchmarks.http_load import compare_to_baseline, percentile, summarize
+from benchmarks.micro import inflate_intel, measure_allocations
+
+pytestmark = pytest.mark.unit
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([0.2], 0.99) == 0.2
+    assert percentile([], 0.5) is None
+
+
+def test_summarize_counts_http_and_transport_errors():
+    summary = summarize([0.01, 0.02, 0.03, 0.04], Counter({200: 3, 503: 1}), errors=2, elapsed=2.0)
+
+    assert summary["requests"] == 6
+    assert summary["errors"] == 3
+    assert summary["statuses"] == {"200": 3, "503": 1}
+    assert summary["throughput_rps"] == 2.0
+    assert summary["latency_ms"]["p50"] == 20.0
+    assert summary["latency_ms"]["max"] == 40.0
+
+
+def test_compare_to_baseline_flags_throughput_drop_and_p95_growth():
+    def result(endpoint, rps, p95):
+        return {"endpoint": endpoint, "concurrency": 10, "throughput_rps": rps, "latency_ms": {"p95": p95}}
+
+    baseline = [result("index", 100.0, 50.0), result("cities", 100.0, 50.0), result("city_page", 100.0, 50.0)]
+    current = [result("index", 80.0, 50.0), result("cities", 98.0, 70.0), result("city_page", 95.0, 52.0)]
+
+    comparisons = {item["endpoint"]: item for item in compare_to_baseline(current, baseline, tolerance=0.15)}
+
+    assert comparisons["index"]["throughput_change"] == -0.2
+    assert comparisons["index"]["regressed"] is True
+    assert comparisons["cities"]["p95_change"] == 0.4
+    assert comparisons["cities"]["regressed"] is True
+    assert comparisons["city_page"]["regressed"] is False
+
+
+def test_synthetic_cities_are_deterministic_and_cycle_fixture_intel():
+    templates = load_fixture_intel()
+
+    first = list(synthetic_cities(len(templates) + 1, templates))
+    second = list(synthetic_cities(len(templates) + 1, templates))
+
+    assert [city["slug"] for city in first][:2] == [bench_slug(0), bench_slug(1)]
+    assert [city["latitude"] for city in first] == [city["latitude"] for city in second]
+    assert first[-1]["intel"] == first[0]["intel"]
+    assert len({city["city_name"] for city in first}) == len(first)
+    assert all(-90 <= city["latitude"] <= 90 and -180 <= city["longitude"] <= 180 for city in first)
+
+
+def test_inflate_intel_multiplies_lists_with_distinct_names():
+    intel = load_fixture_intel()[0]
+
+    inflated = inflate_intel(intel, 3)
+
+    assert len(inflated["modes"]) == 3 * len(intel["modes"])
+    assert len(inflated["authorities"]) == 3 * len(intel["authorities"])
+    assert len({authority["name"] for authority in inflated["authorities"]}) == len(inflated["authorities"])
+    assert inflated["operating_hours"] == intel["operating_hours"]
+    CityIntel.model_validate(inflated)
+
+
+def test_measure_allocations_reports_peak_for_one_call():
+    allocations = measure_allocations(lambda: [bytes(1024) for _ in range(64)])
+
+    assert allocations["peak_kib"] >= 64
@@ -0,0 +1,38 @@
+import gzip
+
+import brotli
+import pytest
+
+from app.compression import CompressedBodyCache, CompressionStats, compress_body
+
+pytestmark = pytest.mark.unit
+
+
+def test_compress_body_round_trips_supported_encodings():
+    body = b"<html>" + b"groundwork " * 200 + b"</html>"
+
+    assert brotli.decompress(compress_body(body, "br", brotli_quality=5, gzip_level=6)) == body
+    assert gzip.decompress(compress_body(body, "gzip", brotli_quality=5, gzip_level=6)) == body
+    with pytest.raises(ValueError):
+        compress_body(body, "deflate", brotli_quality=5, gzip_level=6)
+
+
+def test_compressed_body_cache_evicts_least_recently_used_entries():
+    cache = CompressedBodyCache(max_bytes=10)
+    cache.put(("/a", "", '"1"', "br"), b"aaaa")
+    cache.put(("/b", "", '"2"', "br"), b"bbbb")
+    assert cache.get(("/a", "", '"1"', "br")) == b"aaaa"
+
+    cache.put(("/c", "", '"3"', "br"), b"cccc")
+
+    assert cache.get(("/b", "", '"2"', "br")) is None
+    assert cache.get(("/a", "", '"1"', "br")) == b"aaaa"
+    assert cache.current_bytes == 8
+
+    cache.put(("/big", "", '"4"', "br"), b"x" * 11)
+    assert cache.get(("/big", "", '"4"', "br")) is None
+
+
+def test_compression_stats_ratio():
+    stats = CompressionStats(encoding="br", original_bytes=1000, compressed_bytes=250, duration_ms=0.4, cache_hit=False)
+    assert stats.ratio == 0.25
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from app.geo import CityKDTree, GeoPoint, get_city_index, haversine_km, reset_city_index
+
+pytestmark = pytest.mark.unit
+
+
+def _point(slug: str, latitude: float, longitude: float) -> GeoPoint:
+    return GeoPoint(slug=slug, city_name=slug, country="-", country_code="XX", latitude=latitude, longitude=longitude)
+
+
+def test_haversine_matches_known_distance():
+    assert haversine_km(51.5074, -0.1278, 48.8566, 2.3522) == pytest.approx(343.5, abs=1)
+
+
+def test_kd_tree_matches_brute_force_nearest_neighbours():
+    rng = random.Random(7)
+    points = [_point(f"city-{index}", rng.uniform(-90, 90), rng.uniform(-180, 180)) for index in range(500)]
+    tree = CityKDTree(points)
+
+    for _ in range(50):
+        latitude, longitude = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        expected = sorted(points, key=lambda point: haversine_km(latitude, longitude, point.latitude, point.longitude))[:5]
+
+        found = tree.nearest(latitude, longitude, 5)
+
+        assert [point.slug for _, point in found] == [point.slug for point in expected]
+        for distance, point in found:
+            assert distance == pytest.approx(haversine_km(latitude, longitude, point.latitude, point.longitude), abs=1e-6)
+
+
+def test_kd_tree_handles_antimeridian_and_small_catalogs():
+    tree = CityKDTree([_point("suva-fj", -18.1248, 178.4501), _point("apia-ws", -13.8507, -171.7514)])
+
+    [(distance, nearest)] = tree.nearest(-16.0, -179.9, 1)
+    assert nearest.slug == "suva-fj"
+    assert distance < 300
+    assert len(tree.nearest(0, 0, 10)) == 2
+    assert CityKDTree([]).nearest(0, 0, 3) == []
+
+
+def test_city_index_is_rebuilt_only_when_version_changes():
+    reset_city_index()
+    loads: list[int] = []
+
+    def load() -> list[GeoPoint]:
+        loads.append(1)
+        return [_point("london-gb", 51.5074, -0.1278)]
+
+    first = get_city_index((1, "a"), load)
+    assert get_city_index((1, "a"), load) is first
+    assert get_city_index((2, "b"), load) is not first
+    assert len(loads) == 2
+    reset_city_index()
@@ -0,0 +1,59 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.http_cache import cache_headers, http_date, is_not_modified, make_etag
+
+pytestmark = pytest.mark.unit
+
+
+def test_make_etag_is_strong_and_stable():
+    retrieved_at = datetime(2026, 2, 19, 8, 6, 8, tzinfo=UTC)
+
+    etag = make_etag("city", "barcelona-es", retrieved_at)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("city", "barcelona-es", retrieved_at)
+    assert etag != make_etag("city", "barcelona-es", retrieved_at + timedelta(seconds=1))
+
+
+def test_is_not_modified_matches_if_none_match_with_weak_comparison():
+    etag = make_etag("cities", 3)
+
+    assert is_not_modified({"if-none-match": etag}, etag, None)
+    assert is_not_modified({"if-none-match": f'"other", W/{etag}'}, etag, None)
+    assert is_not_modified({"if-none-match": "*"}, etag, None)
+    assert not is_not_modified({"if-none-match": '"other"'}, etag, None)
+
+
+def test_is_not_modified_prefers_if_none_match_over_if_modified_since():
+    last_modified = datetime(2026, 2, 19, 8, 6, 8, 500000, tzinfo=UTC)
+    headers = {"if-none-match": '"stale"', "if-modified-since": http_date(last_modified)}
+
+    assert not is_not_modified(headers, make_etag("fresh"), last_modified)
+
+
+def test_is_not_modified_uses_if_modified_since_at_second_precision():
+    last_modified = datetime(2026, 2, 19, 8, 6, 8, 500000, tzinfo=UTC)
+    etag = make_etag("fresh")
+
+    assert is_not_modified({"if-modified-since": http_date(last_modified)}, etag, last_modified)
+    assert not is_not_modified(
+        {"if-modified-since": http_date(last_modified - timedelta(seconds=1))}, etag, last_modified
+    )
+    assert not is_not_modified({"if-modified-since": "not a date"}, etag, last_modified)
+    assert not is_not_modified({"if-modified-since": http_date(last_modified)}, etag, None)
+
+
+def test_cache_headers_include_stale_while_revalidate():
+    headers = cache_headers(
+        '"abc"',
+        datetime(2026, 2, 19, 8, 6, 8, tzinfo=UTC),
+        max_age_seconds=60,
+        stale_while_revalidate_seconds=600,
+    )
+
+    assert headers == {
+        "ETag": '"abc"',
+        "Cache-Control": "public, max-age=60, stale-while-revalidate=600",
+        "Last-Modified": "Thu, 19 Feb 2026 08:06:08 GMT",
+    }
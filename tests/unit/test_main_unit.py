@@ -8,8 +8,8 @@ os.environ.setdefault("PERPLEXITY_API_KEY", "test-pplx-key")
 os.environ.setdefault("ADMIN_API_KEY", "test-key")
 os.environ.setdefault("VERIFY_GENERATED_URLS", "false")
 
-from app.main import country_flag, slugify
-from app.models import CityRequestCreate
+from app.main import build_city_card, country_flag, intel_summary_columns, slugify
+from app.models import City, CityIntel, CityRequestCreate
 
 pytestmark = pytest.mark.unit
 
@@ -36,3 +36,29 @@ def test_city_request_create_trims_input():
 def test_city_request_create_rejects_blank_input():
     with pytest.raises(ValidationError):
         CityRequestCreate(raw_input="   ")
+
+
+def test_intel_summary_columns_and_card():
+    intel = CityIntel.model_validate(
+        {
+            "authorities": [{"name": "Transit Authority", "website": "https://example.com", "apps": []}],
+            "modes": [{"type": "metro", "operator": "Metro Co", "notes": "Frequent service"}],
+            "payment_methods": [{"method": "Bank card", "details": "Contactless at gates", "url": None}],
+            "operating_hours": {"weekday": "5-23", "weekend": "6-23", "night_service": None},
+            "rideshare": [
+                {"provider": "Uber", "available": True, "notes": "Available"},
+                {"provider": "Lyft", "available": False, "notes": "Not available"},
+            ],
+            "airport_connections": [],
+            "delay_info": [],
+            "tips": "Tap in.",
+        }
+    )
+
+    summary = intel_summary_columns(intel)
+    assert summary == {"has_metro": True, "contactless": True, "rideshare_providers": ["Uber"]}
+    assert intel_summary_columns(None) == {"has_metro": False, "contactless": False, "rideshare_providers": []}
+
+    card = build_city_card(City(slug="x-us", city_name="X", country="Y", country_code="US", **summary))
+    assert card["has_metro"] is True
+    assert card["rideshare"] == "Uber"
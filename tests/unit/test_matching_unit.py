@@ -0,0 +1,116 @@
+import pytest
+
+from app.matching import CONFIDENT_THRESHOLD, CityMatcher, MatchCandidate, normalize_text
+
+pytestmark = pytest.mark.unit
+
+CATALOG = [
+    MatchCandidate(city_id=1, slug="new-york-us", city_name="New York", country="United States", country_code="US"),
+    MatchCandidate(city_id=2, slug="barcelona-es", city_name="Barcelona", country="Spain", country_code="ES"),
+    MatchCandidate(city_id=3, slug="sao-paulo-br", city_name="São Paulo", country="Brazil", country_code="BR"),
+    MatchCandidate(city_id=4, slug="portland-us", city_name="Portland", country="United States", country_code="US"),
+    MatchCandidate(city_id=5, slug="london-gb", city_name="London", country="United Kingdom", country_code="GB"),
+    MatchCandidate(
+        city_id=6, slug="birmingham-gb", city_name="Birmingham", country="United Kingdom", country_code="GB"
+    ),
+]
+
+
+def test_normalize_text_strips_accents_case_and_punctuation():
+    assert normalize_text("  São  Paulo, BRAZIL! ") == "sao paulo brazil"
+
+
+@pytest.mark.parametrize(
+    ("raw_input", "expected_slug"),
+    [
+        ("NYC", "new-york-us"),
+        ("new york city", "new-york-us"),
+        ("Sao Paulo", "sao-paulo-br"),
+        ("Barcelona, Spain", "barcelona-es"),
+        ("BCN", "barcelona-es"),
+        ("New York, USA", "new-york-us"),
+        ("London, UK", "london-gb"),
+        ("Birmingham, West Midlands, GB", "birmingham-gb"),
+    ],
+)
+def test_matcher_resolves_aliases_exactly(raw_input, expected_slug):
+    match = CityMatcher(CATALOG).match(raw_input)
+
+    assert match is not None
+    assert match.city.slug == expected_slug
+    assert match.score == 1.0
+    assert match.confident
+
+
+def test_matcher_suggests_close_misspellings_without_confidence():
+    match = CityMatcher(CATALOG).match("Barcleona")
+
+    assert match is not None
+    assert match.city.slug == "barcelona-es"
+    assert not match.confident
+    assert match.normalized_input == "barcleona"
+
+
+@pytest.mark.parametrize("raw_input", ["Lagos", "Porto", "Riga, Latvia", "!!!"])
+def test_matcher_ignores_unrelated_inputs(raw_input):
+    assert CityMatcher(CATALOG).match(raw_input) is None
+
+
+@pytest.mark.parametrize(
+    ("raw_input", "expected_slug"),
+    [("London, Ontario", "london-gb"), ("Birmingham, Alabama", "birmingham-gb"), ("Portland, Oregon", "portland-us")],
+)
+def test_matcher_only_suggests_comma_head_matches_in_another_country(raw_input, expected_slug):
+    match = CityMatcher(CATALOG).match(raw_input)
+
+    assert match is not None
+    assert match.city.slug == expected_slug
+    assert match.score < CONFIDENT_THRESHOLD
+    assert not match.confident
+
+
+def test_matcher_keeps_misspelled_head_with_wrong_country_unconfident():
+    match = CityMatcher(CATALOG).match("Londn, Canada")
+
+    assert match is None or not match.confident
+
+
+def test_matcher_only_suggests_initials_shared_by_two_cities():
+    catalog = [
+        MatchCandidate(
+            city_id=7, slug="san-diego-us", city_name="San Diego", country="United States", country_code="US"
+        ),
+        MatchCandidate(
+            city_id=8, slug="santo-domingo-do", city_name="Santo Domingo", country="Dominican Rep.", country_code="DO"
+        ),
+    ]
+
+    match = CityMatcher(catalog).match("SD")
+
+    assert match is not None
+    assert match.city.slug in {"san-diego-us", "santo-domingo-do"}
+    assert not match.confident
+
+
+@pytest.mark.parametrize(("raw_input", "expected_slug"), [("NY", "new-york-us"), ("SP", "sao-paulo-br")])
+def test_matcher_only_suggests_short_codes(raw_input, expected_slug):
+    match = CityMatcher(CATALOG).match(raw_input)
+
+    assert match is not None
+    assert match.city.slug == expected_slug
+    assert not match.confident
+
+
+def test_matcher_only_suggests_an_exact_key_shared_by_two_cities():
+    catalog = [
+        *CATALOG,
+        MatchCandidate(city_id=9, slug="london-ca", city_name="London", country="Canada", country_code="CA"),
+    ]
+
+    match = CityMatcher(catalog).match("London")
+
+    assert match is not None
+    assert match.city.slug in {"london-gb", "london-ca"}
+    assert not match.confident
+    assert CityMatcher(catalog).match("London, Canada").city.slug == "london-ca"
+    assert CityMatcher(catalog).match("London, Canada").confident
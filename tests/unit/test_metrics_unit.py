@@ -0,0 +1,59 @@
+import pytest
+
+from app.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+pytestmark = pytest.mark.unit
+
+
+def test_counter_renders_total_samples_with_escaped_labels():
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("test_requests", "Requests served.", ("route",)))
+
+    requests.inc(route="/cities")
+    requests.inc(2, route='/say "hi"\n')
+
+    assert registry.render() == (
+        "# HELP test_requests Requests served.\n"
+        "# TYPE test_requests counter\n"
+        'test_requests_total{route="/cities"} 1\n'
+        'test_requests_total{route="/say \\"hi\\"\\n"} 2\n'
+    )
+    with pytest.raises(ValueError):
+        requests.inc(-1, route="/cities")
+    with pytest.raises(ValueError):
+        requests.inc(status="200")
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    latency = Histogram("test_latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value, route="/")
+
+    assert latency.count(route="/") == 4
+    assert latency.render().splitlines()[2:] == [
+        'test_latency_seconds_bucket{route="/",le="0.1"} 1',
+        'test_latency_seconds_bucket{route="/",le="1"} 3',
+        'test_latency_seconds_bucket{route="/",le="+Inf"} 4',
+        'test_latency_seconds_sum{route="/"} 4.25',
+        'test_latency_seconds_count{route="/"} 4',
+    ]
+
+
+def test_gauge_tracks_values_or_collects_at_scrape_time():
+    in_flight = Gauge("test_in_flight", "In flight.")
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    assert in_flight.render().splitlines()[-1] == "test_in_flight 1"
+
+    pool = Gauge("test_pool", "Pool.", ("engine",), collect=lambda: {("sync",): 3, ("async",): 0})
+    assert pool.render().splitlines()[2:] == ['test_pool{engine="async"} 0', 'test_pool{engine="sync"} 3']
+
+
+def test_registry_rejects_duplicate_names():
+    registry = MetricsRegistry()
+    registry.register(Counter("test_duplicate", "First."))
+
+    with pytest.raises(ValueError):
+        registry.register(Gauge("test_duplicate", "Second."))
@@ -0,0 +1,35 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from app.pagination import InvalidCursorError, decode_cursor, encode_cursor, split_page
+
+pytestmark = pytest.mark.unit
+
+
+def test_cursor_round_trips_typed_values():
+    retrieved_at = datetime(2026, 2, 19, 8, 6, 8, 123456, tzinfo=UTC)
+
+    cursor = encode_cursor(retrieved_at, "Barcelona")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, datetime, str) == (retrieved_at, "Barcelona")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["not-a-cursor", encode_cursor("2026-02-19T08:06:08+00:00"), encode_cursor("yesterday", 5), encode_cursor(True, True)],
+)
+def test_decode_cursor_rejects_malformed_cursors(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, datetime, int)
+
+
+def test_split_page_returns_cursor_only_when_more_rows_exist():
+    rows = [(3, "c"), (2, "b"), (1, "a")]
+
+    page, cursor = split_page(rows, 2, lambda row: row)
+    assert page == [(3, "c"), (2, "b")]
+    assert decode_cursor(cursor, int, str) == (2, "b")
+
+    assert split_page(rows, 3, lambda row: row) == (rows, None)